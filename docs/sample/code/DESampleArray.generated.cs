@@ -39,3 +39,33 @@ public class DESampleArray
     /// </summary>
     public List<DESampleArray_StructRowArr> structRowArr;
 }
+
+/// <summary>
+/// DESampleArray 테이블 키 조회
+/// </summary>
+public class DESampleArrayTable
+{
+    public readonly List<DESampleArray> datas;
+    private readonly Dictionary<int, DESampleArray> byId;
+
+    public DESampleArrayTable(List<DESampleArray> datas)
+    {
+        this.datas = datas;
+        byId = new Dictionary<int, DESampleArray>(datas.Count);
+
+        foreach (DESampleArray data in datas)
+        {
+            byId.Add(data.id, data);
+        }
+    }
+
+    public DESampleArray GetById(int id)
+    {
+        return byId[id];
+    }
+
+    public bool TryGetById(int id, out DESampleArray data)
+    {
+        return byId.TryGetValue(id, out data);
+    }
+}
@@ -95,3 +95,33 @@ public class DESampleComplex
 
     public DEContentsExp exp;
 }
+
+/// <summary>
+/// DESampleComplex 테이블 키 조회
+/// </summary>
+public class DESampleComplexTable
+{
+    public readonly List<DESampleComplex> datas;
+    private readonly Dictionary<string, DESampleComplex> byId;
+
+    public DESampleComplexTable(List<DESampleComplex> datas)
+    {
+        this.datas = datas;
+        byId = new Dictionary<string, DESampleComplex>(datas.Count);
+
+        foreach (DESampleComplex data in datas)
+        {
+            byId.Add(data.id, data);
+        }
+    }
+
+    public DESampleComplex GetById(string id)
+    {
+        return byId[id];
+    }
+
+    public bool TryGetById(string id, out DESampleComplex data)
+    {
+        return byId.TryGetValue(id, out data);
+    }
+}
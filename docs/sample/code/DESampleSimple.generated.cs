@@ -12,3 +12,33 @@ public class DESampleSimple
     public bool boolVal;
     public DEDayOfWeek enumVal;
 }
+
+/// <summary>
+/// DESampleSimple 테이블 키 조회
+/// </summary>
+public class DESampleSimpleTable
+{
+    public readonly List<DESampleSimple> datas;
+    private readonly Dictionary<int, DESampleSimple> byId;
+
+    public DESampleSimpleTable(List<DESampleSimple> datas)
+    {
+        this.datas = datas;
+        byId = new Dictionary<int, DESampleSimple>(datas.Count);
+
+        foreach (DESampleSimple data in datas)
+        {
+            byId.Add(data.id, data);
+        }
+    }
+
+    public DESampleSimple GetById(int id)
+    {
+        return byId[id];
+    }
+
+    public bool TryGetById(int id, out DESampleSimple data)
+    {
+        return byId.TryGetValue(id, out data);
+    }
+}
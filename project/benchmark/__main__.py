@@ -0,0 +1,46 @@
+import argparse
+import json
+import tempfile
+from benchmark.export_benchmark import ExportBenchmark
+from benchmark.workbook_generator import WorkbookGenerator
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog='python -m benchmark')
+    parser.add_argument('--shapes', nargs='+', choices=WorkbookGenerator.SHAPES, default=WorkbookGenerator.SHAPES, help='만들 테이블 모양')
+    parser.add_argument('--rows', nargs='+', type=int, default=[1000], help='테이블 레코드 수 목록')
+    parser.add_argument('--columns', type=int, default=5, help='simple: 값 컬럼 수, array/complex: 배열 항목 수와 구조체 멤버 수')
+    parser.add_argument('--depth', type=int, default=1, help='complex: 중첩 구조체 깊이')
+    parser.add_argument('--repeat', type=int, default=3, help='단계별 반복 측정 횟수')
+    parser.add_argument('--seed', type=int, default=0, help='셀 값 생성 시드')
+    parser.add_argument('--work-dir', help='생성한 스키마, 엑셀, 어셋을 둘 디렉토리. 없으면 임시 디렉토리')
+    parser.add_argument('--output', help='JSON 보고서 파일 경로')
+    parser.add_argument('--baseline', help='비교할 이전 JSON 보고서 파일 경로')
+    parser.add_argument('--no-memory', action='store_true', help='tracemalloc 메모리 측정 생략')
+    parser.add_argument('--strict', action='store_true', help='jsonschema 전체 검사(validate 단계)도 측정')
+    return parser.parse_args()
+
+def run(args, work_dir_path):
+    benchmark = ExportBenchmark(work_dir_path, args.repeat, not args.no_memory, args.seed, args.strict)
+    cases = [(shape, rows, args.columns, args.depth) for rows in args.rows for shape in args.shapes]
+    report = benchmark.run(cases)
+
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf8') as fp:
+            json.dump(report, fp, indent=4, ensure_ascii=False)
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r', encoding='utf8') as fp:
+            baseline = json.load(fp)
+        print(ExportBenchmark.compare_reports(report, baseline))
+
+def main():
+    args = parse_args()
+
+    if args.work_dir is not None:
+        run(args, args.work_dir)
+    else:
+        with tempfile.TemporaryDirectory() as work_dir_path:
+            run(args, work_dir_path)
+
+if __name__ == '__main__':
+    main()
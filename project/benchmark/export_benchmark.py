@@ -0,0 +1,152 @@
+import os
+import platform
+import shutil
+import statistics
+import tracemalloc
+from benchmark.workbook_generator import WorkbookGenerator
+from exporter.data_exporter import DataExporter
+from exporter.stage_profiler import StageProfiler
+
+# DataExporter.export_table() 을 그대로 실행하고 StageProfiler 가 남긴 단계별 이벤트로 시간과 메모리를 잰다.
+class ExportBenchmark:
+    VERSION = 2
+    # export_table() 의 단계. sort 는 정렬 키가 있을 때, validate 는 strict 일 때만 기록됨
+    # 레코드는 읽으면서 쓰므로 load_datas 는 sort, validate, write_asset 안에서 레코드를 읽는 데 쓴 시간의 합계
+    STAGES = ['export_table', 'load_schema', 'create_type_info', 'check_manifest', 'load_workbook', 'parse_header', 'load_datas', 'sort', 'validate', 'write_asset']
+
+    def __init__(self, work_dir_path, repeat=3, measures_memory=True, seed=0, strict=False):
+        self.work_dir_path = work_dir_path
+        self.repeat = repeat
+        self.measures_memory = measures_memory  # True: 시간 측정 후 tracemalloc 을 켜고 한 번 더 실행해 단계별 최대 메모리 기록
+        self.strict = strict    # True: jsonschema 전체 검사(validate 단계)도 실행
+        self.schema_dir_path = os.path.join(work_dir_path, 'schema')
+        self.table_dir_path = os.path.join(work_dir_path, 'table')
+        self.asset_dir_path = os.path.join(work_dir_path, 'asset')
+        self.generator = WorkbookGenerator(self.schema_dir_path, self.table_dir_path, seed)
+
+    # @param cases [(shape, rows, columns, depth)]
+    # @return 실행 환경이 달라도 비교할 수 있는 JSON 보고서
+    def run(self, cases):
+        for dir_path in [self.schema_dir_path, self.table_dir_path, self.asset_dir_path]:
+            os.makedirs(dir_path, exist_ok=True)
+
+        table_reports = []
+        for shape, rows, columns, depth in cases:
+            table_name = self.generator.generate(shape, rows, columns, depth)
+            print('Generated: {}'.format(table_name))
+
+            table_report = self.run_table(table_name)
+            table_report.update({ 'shape': shape, 'rows': rows, 'columns': columns, 'depth': depth })
+            table_reports.append(table_report)
+
+            print(ExportBenchmark.format_table_report(table_report))
+
+        return {
+            'version': ExportBenchmark.VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': self.repeat,
+            'strict': self.strict,
+            'max_rss_bytes': StageProfiler.get_max_rss_bytes(),
+            'tables': table_reports
+        }
+
+    def run_table(self, table_name):
+        stage_seconds = {}  # { 단계명 : [실행별 시간] }
+        counts = {}
+
+        for _ in range(self.repeat):
+            for event in self.export_table(table_name, StageProfiler()):
+                stage_seconds.setdefault(event['name'], []).append(event['wall_seconds'])
+                counts.update(event['counts'])
+
+        stages = {}
+        for stage in ExportBenchmark.STAGES:
+            if stage in stage_seconds:
+                stages[stage] = {
+                    'min': min(stage_seconds[stage]),
+                    'median': statistics.median(stage_seconds[stage]),
+                    'runs': stage_seconds[stage]
+                }
+
+        if self.measures_memory:
+            for stage, peak_bytes in self.measure_peak_memory(table_name).items():
+                if stage in stages:
+                    stages[stage]['peak_bytes'] = peak_bytes
+
+        return {
+            'table_name': table_name,
+            'xlsx_bytes': os.path.getsize(os.path.join(self.table_dir_path, table_name + '.xlsx')),
+            'total_seconds': stages['export_table']['median'],
+            'records': counts.get('records', 0),
+            'cells': counts.get('cells', 0),
+            'stages': stages
+        }
+
+    # 단계 시작 시점에 최대값을 초기화하므로 각 단계의 최대 메모리는 이전 단계에서 남은 데이터를 포함한다.
+    def measure_peak_memory(self, table_name):
+        tracemalloc.start()
+        try:
+            events = self.export_table(table_name, StageProfiler(True))
+        finally:
+            tracemalloc.stop()
+
+        return { event['name']: event['traced_peak_bytes'] for event in events }
+
+    # 매 실행마다 새 DataExporter 로 캐시 없이 처음부터 내보낸다.
+    # @return 이 테이블의 단계 이벤트 목록
+    def export_table(self, table_name, profiler):
+        shutil.rmtree(self.asset_dir_path, ignore_errors=True)
+        os.makedirs(self.asset_dir_path)
+
+        exporter = DataExporter(self.create_config_json(), profiler)
+        exporter.export_table(table_name)
+
+        return [event for event in profiler.pop_events() if event['target'] == table_name]
+
+    def create_config_json(self):
+        return {
+            'schema_dir_path': self.schema_dir_path,
+            'table_dir_path': self.table_dir_path,
+            'asset_dir_path': self.asset_dir_path,
+            'force': True,
+            'strict': self.strict
+        }
+
+    @staticmethod
+    def format_table_report(table_report):
+        lines = ['{}: records:{}, cells:{}, total:{:.3f}s'.format(table_report['table_name'], table_report['records'], table_report['cells'], table_report['total_seconds'])]
+
+        for stage in ExportBenchmark.STAGES:
+            stage_report = table_report['stages'].get(stage)
+            if stage_report is None:
+                continue
+
+            line = '    {:<16} {:>10.4f}s'.format(stage, stage_report['median'])
+            if 'peak_bytes' in stage_report:
+                line += ' {:>10.1f}MB'.format(stage_report['peak_bytes'] / (1024 * 1024))
+            lines.append(line)
+
+        return '\n'.join(lines)
+
+    # 이전 보고서와 테이블명이 같은 항목끼리 단계별 중간값 비율(현재 / 이전)을 구한다.
+    @staticmethod
+    def compare_reports(report, baseline):
+        baseline_tables = { table_report['table_name']: table_report for table_report in baseline['tables'] }
+        lines = []
+
+        for table_report in report['tables']:
+            baseline_table = baseline_tables.get(table_report['table_name'])
+            if baseline_table is None:
+                continue
+
+            lines.append('{}: total x{:.2f}'.format(table_report['table_name'], table_report['total_seconds'] / baseline_table['total_seconds']))
+            for stage in ExportBenchmark.STAGES:
+                if not stage in table_report['stages'] or not stage in baseline_table['stages']:
+                    continue
+
+                baseline_seconds = baseline_table['stages'][stage]['median']
+                if baseline_seconds > 0:
+                    lines.append('    {:<16} x{:.2f}'.format(stage, table_report['stages'][stage]['median'] / baseline_seconds))
+
+        return '\n'.join(lines)
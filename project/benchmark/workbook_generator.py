@@ -0,0 +1,215 @@
+import json
+import os
+import random
+from openpyxl import Workbook
+
+DAY_OF_WEEKS = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+# 합성 테이블의 스키마 노드와 엑셀 배치 정보
+class SyntheticNode:
+    def __init__(self, name, value_type, array_direction=None, width=1):
+        self.name = name
+        self.value_type = value_type    # 'integer', 'number', 'string', 'boolean', 'enum', 'object'
+        self.array_direction = array_direction  # None, 'col': 열방향 배열, 'row': 행방향 배열
+        self.width = width  # 열방향 배열의 컬럼 수. 행방향 배열은 항목 수
+        self.members = []   # [SyntheticNode]
+
+    def add_member(self, member):
+        self.members.append(member)
+        return member
+
+    def to_schema(self):
+        if self.value_type == 'object':
+            item_schema = {
+                'type': 'object',
+                'properties': { member.name: member.to_schema() for member in self.members }
+            }
+        elif self.value_type == 'enum':
+            item_schema = { 'type': 'string', 'enum': DAY_OF_WEEKS }
+        else:
+            item_schema = { 'type': self.value_type }
+
+        if self.array_direction is None:
+            return item_schema
+
+        return { 'type': 'array', 'items': item_schema }
+
+    def calc_depth(self):
+        return 1 + max([member.calc_depth() for member in self.members], default=0)
+
+    # 열방향 배열은 항목 수만큼 컬럼을 반복
+    def calc_column_count(self):
+        item_column_count = sum(member.calc_column_count() for member in self.members) if self.value_type == 'object' else 1
+        return item_column_count * (self.width if self.array_direction == 'col' else 1)
+
+# SampleSimple, SampleArray, SampleComplex 와 같은 모양의 스키마, 엑셀 테이블을 크기를 지정해 만든다.
+# 같은 인자와 시드면 같은 파일을 만든다.
+class WorkbookGenerator:
+    SHAPES = ['simple', 'array', 'complex']
+    SCALAR_TYPES = ['integer', 'number', 'string', 'boolean', 'enum']
+
+    def __init__(self, schema_dir_path, table_dir_path, seed=0):
+        self.schema_dir_path = schema_dir_path
+        self.table_dir_path = table_dir_path
+        self.seed = seed
+
+    # @param columns simple: 값 컬럼 수, array/complex: 배열 항목 수, 구조체 멤버 수
+    # @param depth complex: 보상 조건 구조체의 중첩 깊이
+    # @return 테이블명
+    def generate(self, shape, rows, columns, depth):
+        table_name = '{}{}_{}x{}d{}'.format(shape[:1].upper(), shape[1:], rows, columns, depth)
+        root = self.create_root_node(shape, columns, depth)
+
+        schema = {
+            '$schema': 'http://json-schema.org/draft-07/schema#',
+            '$id': table_name + '.table.json',
+            'title': table_name,
+            'type': 'array',
+            'items': root.to_schema()
+        }
+        schema['items']['required'] = ['id']
+
+        with open(os.path.join(self.schema_dir_path, table_name + '.table.json'), 'w', encoding='utf8') as fp:
+            json.dump(schema, fp, indent=4, ensure_ascii=False)
+
+        self.write_workbook(os.path.join(self.table_dir_path, table_name + '.xlsx'), root, rows)
+        return table_name
+
+    def create_root_node(self, shape, columns, depth):
+        root = SyntheticNode('_root', 'object')
+
+        if shape == 'simple':
+            root.add_member(SyntheticNode('id', 'integer'))
+            for idx in range(columns):
+                value_type = WorkbookGenerator.SCALAR_TYPES[idx % len(WorkbookGenerator.SCALAR_TYPES)]
+                root.add_member(SyntheticNode('{}Val{}'.format(value_type, idx), value_type))
+
+        elif shape == 'array':
+            root.add_member(SyntheticNode('id', 'integer'))
+            root.add_member(SyntheticNode('colArr', 'integer', 'col', columns))
+            root.add_member(SyntheticNode('rowArr', 'integer', 'row', columns))
+            for name, direction in [('structColArr', 'col'), ('structRowArr', 'row')]:
+                struct_node = root.add_member(SyntheticNode(name, 'object', direction, columns))
+                struct_node.add_member(SyntheticNode('name', 'string'))
+                struct_node.add_member(SyntheticNode('value', 'integer'))
+
+        elif shape == 'complex':
+            root.add_member(SyntheticNode('id', 'string'))
+            root.add_member(SyntheticNode('name', 'string'))
+
+            open_time_node = root.add_member(SyntheticNode('openTimes', 'object', 'col', 2))
+            open_time_node.add_member(SyntheticNode('dayOfWeek', 'enum'))
+            open_time_node.add_member(SyntheticNode('startTime', 'string'))
+            open_time_node.add_member(SyntheticNode('endTime', 'string'))
+
+            reward_node = root.add_member(SyntheticNode('rewards', 'object', 'row', 3))
+            reward_node.add_member(SyntheticNode('itemId', 'integer'))
+            reward_node.add_member(SyntheticNode('count', 'integer'))
+
+            condition_node = reward_node.add_member(SyntheticNode('condition', 'object'))
+            for level in range(depth):
+                condition_node.add_member(SyntheticNode('firstClear', 'boolean'))
+                condition_node.add_member(SyntheticNode('timeLimit', 'integer'))
+                if level < depth - 1:
+                    condition_node = condition_node.add_member(SyntheticNode('next', 'object'))
+
+            message_node = reward_node.add_member(SyntheticNode('messages', 'object', 'row', 2))
+            message_node.add_member(SyntheticNode('text', 'string'))
+            message_node.add_member(SyntheticNode('delay', 'number'))
+
+            exp_node = root.add_member(SyntheticNode('exp', 'object'))
+            for idx in range(columns):
+                exp_node.add_member(SyntheticNode('exp{}'.format(idx), 'integer'))
+
+        else:
+            raise Exception('Invalid shape: {}'.format(shape))
+
+        return root
+
+    # write_only 모드로 헤더와 레코드를 행 순서대로 쓴다.
+    def write_workbook(self, table_file_path, root, rows):
+        header_row_count = root.calc_depth() - 1
+        column_count = root.calc_column_count()
+        rand = random.Random(self.seed)
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Data')
+
+        header_rows = [[None] * column_count for _ in range(header_row_count)]
+        WorkbookGenerator.place_header(root, header_rows, 0, 0)
+        for header_row in header_rows:
+            ws.append(header_row)
+
+        for record_idx in range(rows):
+            record_rows = []
+            WorkbookGenerator.place_object(root, record_rows, 0, 0, column_count, rand, record_idx + 1)
+            for record_row in record_rows:
+                ws.append(record_row)
+
+        wb.save(table_file_path)
+
+    # 중간 노드는 자기 깊이의 행에, 리프는 마지막 헤더 행에 이름을 쓴다.
+    # @return 다음 컬럼 위치
+    @staticmethod
+    def place_header(node, header_rows, depth, col_idx):
+        for member in node.members:
+            for _ in range(member.width if member.array_direction == 'col' else 1):
+                if member.value_type == 'object':
+                    header_rows[depth][col_idx] = member.name
+                    col_idx = WorkbookGenerator.place_header(member, header_rows, depth + 1, col_idx)
+                else:
+                    header_rows[-1][col_idx] = member.name
+                    col_idx += 1
+
+        return col_idx
+
+    # 오브젝트 하나를 row_idx 행부터 쓴다. 행방향 배열 항목은 아래 행으로 이어진다.
+    # @return 사용한 행 수
+    @staticmethod
+    def place_object(node, record_rows, row_idx, col_idx, column_count, rand, record_id):
+        row_count = 1
+        WorkbookGenerator.ensure_rows(record_rows, row_idx + 1, column_count)
+
+        for member in node.members:
+            if member.array_direction == 'row':
+                item_row_idx = row_idx
+                for _ in range(member.width):
+                    item_row_idx += WorkbookGenerator.place_item(member, record_rows, item_row_idx, col_idx, column_count, rand, record_id)
+                row_count = max(row_count, item_row_idx - row_idx)
+                col_idx += member.calc_column_count()
+            else:
+                for _ in range(member.width if member.array_direction == 'col' else 1):
+                    item_row_count = WorkbookGenerator.place_item(member, record_rows, row_idx, col_idx, column_count, rand, record_id)
+                    row_count = max(row_count, item_row_count)
+                    col_idx += member.calc_column_count() // (member.width if member.array_direction == 'col' else 1)
+
+        return row_count
+
+    @staticmethod
+    def place_item(node, record_rows, row_idx, col_idx, column_count, rand, record_id):
+        if node.value_type == 'object':
+            return WorkbookGenerator.place_object(node, record_rows, row_idx, col_idx, column_count, rand, record_id)
+
+        WorkbookGenerator.ensure_rows(record_rows, row_idx + 1, column_count)
+        record_rows[row_idx][col_idx] = WorkbookGenerator.create_value(node, rand, record_id)
+        return 1
+
+    @staticmethod
+    def ensure_rows(record_rows, row_count, column_count):
+        while len(record_rows) < row_count:
+            record_rows.append([None] * column_count)
+
+    @staticmethod
+    def create_value(node, rand, record_id):
+        if node.name == 'id':
+            return record_id if node.value_type == 'integer' else 'stage_{}'.format(record_id)
+        elif node.value_type == 'integer':
+            return rand.randint(0, 100000)
+        elif node.value_type == 'number':
+            return round(rand.uniform(0, 1000), 3)
+        elif node.value_type == 'boolean':
+            return rand.random() < 0.5
+        elif node.value_type == 'enum':
+            return rand.choice(DAY_OF_WEEKS)
+        else:
+            return 'text_{}'.format(rand.randint(0, 100000))
@@ -12,6 +12,9 @@ def to_comment(comment, indent_depth, formatting):
     text += indentation + '/// </summary>' + formatting.line_sep
     return text
 
+def to_line(code, indent_depth, formatting):
+    return to_indentation(indent_depth, formatting) + code + formatting.line_sep
+
 class CodeBlock:
     def __init__(self):
         self.name = ''
@@ -73,6 +76,8 @@ class ObjectCodeMember():
         self.type = ''
         self.is_array = False
         self.comment = ''
+        self.index = 0  # 스키마 정의 순서. 바이너리 어셋의 멤버 키
+        self.read_kind = '' # 바이너리 어셋 값 유형. 'int', 'float', 'bool', 'string', 'enum', 'object'
 
     def to_code(self, indent_depth, formatting):
         text = ''
@@ -88,11 +93,51 @@ class ObjectCodeMember():
 
         return text
 
+    # switch 문의 case 하나. 배열이면 항목 수만큼 읽어 List 에 담는다.
+    def to_read_code(self, indent_depth, formatting):
+        text = to_line('case {}:'.format(self.index), indent_depth, formatting)
+
+        if self.is_array:
+            text += to_line('{', indent_depth + 1, formatting)
+            text += to_line('int itemCount = reader.ReadArrayHeader();', indent_depth + 2, formatting)
+            text += to_line('data.{} = new List<{}>(itemCount);'.format(self.name, self.type), indent_depth + 2, formatting)
+            text += to_line('for (int itemIdx = 0; itemIdx < itemCount; itemIdx++)', indent_depth + 2, formatting)
+            text += to_line('{', indent_depth + 2, formatting)
+            text += to_line('data.{}.Add({});'.format(self.name, self.to_read_expression()), indent_depth + 3, formatting)
+            text += to_line('}', indent_depth + 2, formatting)
+            text += to_line('}', indent_depth + 1, formatting)
+        else:
+            text += to_line('data.{} = {};'.format(self.name, self.to_read_expression()), indent_depth + 1, formatting)
+
+        text += to_line('break;', indent_depth + 1, formatting)
+        return text
+
+    def to_read_expression(self):
+        # nullable 타입('?')은 원래 타입으로 읽어 대입
+        value_type = self.type.rstrip('?')
+
+        if self.read_kind == 'int':
+            return 'reader.ReadInt()'
+        elif self.read_kind == 'float':
+            return 'reader.ReadFloat()'
+        elif self.read_kind == 'bool':
+            return 'reader.ReadBool()'
+        elif self.read_kind == 'string':
+            return 'reader.ReadString()'
+        elif self.read_kind == 'enum':
+            return '({})reader.ReadInt()'.format(value_type)
+        elif self.read_kind == 'object':
+            return '{}.ReadFrom(reader)'.format(value_type)
+        else:
+            raise Exception('Not supported read kind! member: {}, read_kind: {}'.format(self.name, self.read_kind))
+
 class ObjectCodeBlock(CodeBlock):
     def __init__(self):
         super().__init__()
         self.is_struct = False   # True: struct
+        self.is_table = False   # True: 테이블 스키마 최상위 배열의 항목
         self.members = []   # ObjectCodeMember[]
+        self.binary_reader_name = ''    # 바이너리 어셋 읽기 클래스명. 비어 있으면 읽기 함수를 만들지 않음
     
     def to_code(self, indent_depth, formatting):
         text = ''
@@ -113,7 +158,366 @@ class ObjectCodeBlock(CodeBlock):
                 text += formatting.line_sep
 
             text += member.to_code(indent_depth + 1, formatting)
+
+        if len(self.binary_reader_name) != 0:
+            text += formatting.line_sep
+            text += self.to_read_from_code(indent_depth + 1, formatting)
+
+            if self.is_table:
+                text += formatting.line_sep
+                text += self.to_read_table_code(indent_depth + 1, formatting)
         
         text += indentation + '}' + formatting.line_sep
 
-        return text
\ No newline at end of file
+        return text
+
+    # 바이너리 어셋의 { 멤버 인덱스 : 값 } 맵을 읽는 함수. 모르는 인덱스는 건너뛴다.
+    def to_read_from_code(self, indent_depth, formatting):
+        text = to_line('public static {} ReadFrom({} reader)'.format(self.name, self.binary_reader_name), indent_depth, formatting)
+        text += to_line('{', indent_depth, formatting)
+        text += to_line('{0} data = new {0}();'.format(self.name), indent_depth + 1, formatting)
+        text += formatting.line_sep
+        text += to_line('int memberCount = reader.ReadMapHeader();', indent_depth + 1, formatting)
+        text += to_line('for (int memberIdx = 0; memberIdx < memberCount; memberIdx++)', indent_depth + 1, formatting)
+        text += to_line('{', indent_depth + 1, formatting)
+        text += to_line('switch (reader.ReadInt())', indent_depth + 2, formatting)
+        text += to_line('{', indent_depth + 2, formatting)
+
+        for member in self.members:
+            text += member.to_read_code(indent_depth + 3, formatting)
+
+        text += to_line('default:', indent_depth + 3, formatting)
+        text += to_line('reader.Skip();', indent_depth + 4, formatting)
+        text += to_line('break;', indent_depth + 4, formatting)
+        text += to_line('}', indent_depth + 2, formatting)
+        text += to_line('}', indent_depth + 1, formatting)
+        text += formatting.line_sep
+        text += to_line('return data;', indent_depth + 1, formatting)
+        text += to_line('}', indent_depth, formatting)
+        return text
+
+    # 테이블 바이너리 어셋 전체를 읽는 함수. 레코드가 없으면 nil
+    def to_read_table_code(self, indent_depth, formatting):
+        text = to_line('public static List<{}> ReadTable(byte[] bytes)'.format(self.name), indent_depth, formatting)
+        text += to_line('{', indent_depth, formatting)
+        text += to_line('{0} reader = new {0}(bytes);'.format(self.binary_reader_name), indent_depth + 1, formatting)
+        text += to_line('if (reader.TryReadNil())', indent_depth + 1, formatting)
+        text += to_line('{', indent_depth + 1, formatting)
+        text += to_line('return new List<{}>();'.format(self.name), indent_depth + 2, formatting)
+        text += to_line('}', indent_depth + 1, formatting)
+        text += formatting.line_sep
+        text += to_line('int count = reader.ReadArrayHeader();', indent_depth + 1, formatting)
+        text += to_line('List<{0}> datas = new List<{0}>(count);'.format(self.name), indent_depth + 1, formatting)
+        text += to_line('for (int idx = 0; idx < count; idx++)', indent_depth + 1, formatting)
+        text += to_line('{', indent_depth + 1, formatting)
+        text += to_line('datas.Add(ReadFrom(reader));', indent_depth + 2, formatting)
+        text += to_line('}', indent_depth + 1, formatting)
+        text += to_line('return datas;', indent_depth + 1, formatting)
+        text += to_line('}', indent_depth, formatting)
+        return text
+# 바이너리 어셋(MessagePack 형식) 읽기 클래스
+# 내보내기 도구가 쓰는 형식(nil, bool, 정수, float64, 문자열, 배열, 맵)만 지원한다.
+class BinaryAssetReaderCodeBlock(CodeBlock):
+    TEMPLATE = '''public class {name}
+{{
+    private readonly byte[] bytes;
+    private int position;
+
+    public {name}(byte[] bytes)
+    {{
+        this.bytes = bytes;
+        this.position = 0;
+    }}
+
+    public bool TryReadNil()
+    {{
+        if (bytes[position] != 0xc0)
+        {{
+            return false;
+        }}
+
+        position++;
+        return true;
+    }}
+
+    public int ReadArrayHeader()
+    {{
+        byte code = bytes[position++];
+        if ((code & 0xf0) == 0x90)
+        {{
+            return code & 0x0f;
+        }}
+
+        switch (code)
+        {{
+            case 0xdc: return (int)ReadBigEndian(2);
+            case 0xdd: return checked((int)ReadBigEndian(4));
+        }}
+        throw CreateInvalidCodeException(code);
+    }}
+
+    public int ReadMapHeader()
+    {{
+        byte code = bytes[position++];
+        if ((code & 0xf0) == 0x80)
+        {{
+            return code & 0x0f;
+        }}
+
+        switch (code)
+        {{
+            case 0xde: return (int)ReadBigEndian(2);
+            case 0xdf: return checked((int)ReadBigEndian(4));
+        }}
+        throw CreateInvalidCodeException(code);
+    }}
+
+    public long ReadLong()
+    {{
+        byte code = bytes[position++];
+        if (code <= 0x7f)
+        {{
+            return code;
+        }}
+        if (code >= 0xe0)
+        {{
+            return unchecked((sbyte)code);
+        }}
+
+        switch (code)
+        {{
+            case 0xcc: return (long)ReadBigEndian(1);
+            case 0xcd: return (long)ReadBigEndian(2);
+            case 0xce: return (long)ReadBigEndian(4);
+            case 0xcf: return checked((long)ReadBigEndian(8));
+            case 0xd0: return unchecked((sbyte)ReadBigEndian(1));
+            case 0xd1: return unchecked((short)ReadBigEndian(2));
+            case 0xd2: return unchecked((int)ReadBigEndian(4));
+            case 0xd3: return unchecked((long)ReadBigEndian(8));
+        }}
+        throw CreateInvalidCodeException(code);
+    }}
+
+    public int ReadInt()
+    {{
+        return checked((int)ReadLong());
+    }}
+
+    public double ReadDouble()
+    {{
+        byte code = bytes[position];
+        switch (code)
+        {{
+            case 0xca:
+                position++;
+                return BitConverter.ToSingle(BitConverter.GetBytes(unchecked((int)ReadBigEndian(4))), 0);
+            case 0xcb:
+                position++;
+                return BitConverter.Int64BitsToDouble(unchecked((long)ReadBigEndian(8)));
+        }}
+        return ReadLong();
+    }}
+
+    public float ReadFloat()
+    {{
+        return (float)ReadDouble();
+    }}
+
+    public bool ReadBool()
+    {{
+        byte code = bytes[position++];
+        switch (code)
+        {{
+            case 0xc2: return false;
+            case 0xc3: return true;
+        }}
+        throw CreateInvalidCodeException(code);
+    }}
+
+    public string ReadString()
+    {{
+        byte code = bytes[position++];
+        int length;
+        if ((code & 0xe0) == 0xa0)
+        {{
+            length = code & 0x1f;
+        }}
+        else
+        {{
+            switch (code)
+            {{
+                case 0xd9: length = (int)ReadBigEndian(1); break;
+                case 0xda: length = (int)ReadBigEndian(2); break;
+                case 0xdb: length = checked((int)ReadBigEndian(4)); break;
+                default: throw CreateInvalidCodeException(code);
+            }}
+        }}
+
+        string value = Encoding.UTF8.GetString(bytes, position, length);
+        position += length;
+        return value;
+    }}
+
+    /// <summary>
+    /// 값 하나를 읽지 않고 건너뜀. 코드보다 새로운 어셋의 모르는 멤버용
+    /// </summary>
+    public void Skip()
+    {{
+        byte code = bytes[position];
+        if (code <= 0x7f || code >= 0xe0 || (code >= 0xcc && code <= 0xd3))
+        {{
+            ReadLong();
+        }}
+        else if ((code & 0xe0) == 0xa0 || (code >= 0xd9 && code <= 0xdb))
+        {{
+            ReadString();
+        }}
+        else if ((code & 0xf0) == 0x90 || code == 0xdc || code == 0xdd)
+        {{
+            int count = ReadArrayHeader();
+            for (int idx = 0; idx < count; idx++)
+            {{
+                Skip();
+            }}
+        }}
+        else if ((code & 0xf0) == 0x80 || code == 0xde || code == 0xdf)
+        {{
+            int count = ReadMapHeader();
+            for (int idx = 0; idx < count * 2; idx++)
+            {{
+                Skip();
+            }}
+        }}
+        else if (code == 0xca || code == 0xcb)
+        {{
+            ReadDouble();
+        }}
+        else if (code == 0xc0 || code == 0xc2 || code == 0xc3)
+        {{
+            position++;
+        }}
+        else
+        {{
+            throw CreateInvalidCodeException(code);
+        }}
+    }}
+
+    private ulong ReadBigEndian(int size)
+    {{
+        ulong value = 0;
+        for (int idx = 0; idx < size; idx++)
+        {{
+            value = (value << 8) | bytes[position++];
+        }}
+        return value;
+    }}
+
+    private Exception CreateInvalidCodeException(byte code)
+    {{
+        return new FormatException(string.Format("Invalid binary asset code 0x{{0:x2}} at {{1}}", code, position - 1));
+    }}
+}}'''
+
+    def to_code(self, indent_depth, formatting):
+        text = ''
+
+        if len(self.comment) != 0:
+            text += to_comment(self.comment, indent_depth, formatting)
+
+        # 템플릿은 공백 4칸 들여쓰기 기준
+        for line in BinaryAssetReaderCodeBlock.TEMPLATE.format(name=self.name).split('\n'):
+            code = line.lstrip(' ')
+            if len(code) == 0:
+                text += formatting.line_sep
+            else:
+                text += to_line(code, indent_depth + (len(line) - len(code)) // 4, formatting)
+
+        return text
+
+class TableIndexCodeKey():
+    def __init__(self):
+        self.name = ''  # 테이블 항목 클래스의 멤버명
+        self.type = ''  # 멤버 타입
+
+    def to_method_suffix(self):
+        return self.name[:1].upper() + self.name[1:]
+
+    def to_field_name(self):
+        return 'by' + self.to_method_suffix()
+
+# 테이블 항목 목록을 키로 찾는 컨테이너 클래스
+# 기본 키는 Dictionary 로, 보조 키는 키 값별 항목 목록으로 색인한다.
+class TableIndexCodeBlock(CodeBlock):
+    def __init__(self):
+        super().__init__()
+        self.data_type = ''     # 테이블 항목 클래스명
+        self.primary_key = None    # TableIndexCodeKey. 값이 겹치지 않는 키
+        self.secondary_keys = []    # TableIndexCodeKey[] 값이 겹칠 수 있는 키
+
+    def to_code(self, indent_depth, formatting):
+        text = ''
+
+        if len(self.comment) != 0:
+            text += to_comment(self.comment, indent_depth, formatting)
+
+        data_type = self.data_type
+        primary_key = self.primary_key
+
+        text += to_line('public class {}'.format(self.name), indent_depth, formatting)
+        text += to_line('{', indent_depth, formatting)
+        if len(self.secondary_keys) > 0:
+            text += to_line('private static readonly List<{0}> emptyDatas = new List<{0}>(0);'.format(data_type), indent_depth + 1, formatting)
+            text += formatting.line_sep
+        text += to_line('public readonly List<{}> datas;'.format(data_type), indent_depth + 1, formatting)
+        text += to_line('private readonly Dictionary<{}, {}> {};'.format(primary_key.type, data_type, primary_key.to_field_name()), indent_depth + 1, formatting)
+        for key in self.secondary_keys:
+            text += to_line('private readonly Dictionary<{}, List<{}>> {};'.format(key.type, data_type, key.to_field_name()), indent_depth + 1, formatting)
+        text += formatting.line_sep
+
+        # 생성자
+        text += to_line('public {}(List<{}> datas)'.format(self.name, data_type), indent_depth + 1, formatting)
+        text += to_line('{', indent_depth + 1, formatting)
+        text += to_line('this.datas = datas;', indent_depth + 2, formatting)
+        text += to_line('{} = new Dictionary<{}, {}>(datas.Count);'.format(primary_key.to_field_name(), primary_key.type, data_type), indent_depth + 2, formatting)
+        for key in self.secondary_keys:
+            text += to_line('{} = new Dictionary<{}, List<{}>>();'.format(key.to_field_name(), key.type, data_type), indent_depth + 2, formatting)
+        text += formatting.line_sep
+        text += to_line('foreach ({} data in datas)'.format(data_type), indent_depth + 2, formatting)
+        text += to_line('{', indent_depth + 2, formatting)
+        text += to_line('{}.Add(data.{}, data);'.format(primary_key.to_field_name(), primary_key.name), indent_depth + 3, formatting)
+        for key in self.secondary_keys:
+            text += formatting.line_sep
+            text += to_line('List<{}> {}Datas;'.format(data_type, key.name), indent_depth + 3, formatting)
+            text += to_line('if (!{}.TryGetValue(data.{}, out {}Datas))'.format(key.to_field_name(), key.name, key.name), indent_depth + 3, formatting)
+            text += to_line('{', indent_depth + 3, formatting)
+            text += to_line('{}Datas = new List<{}>();'.format(key.name, data_type), indent_depth + 4, formatting)
+            text += to_line('{}.Add(data.{}, {}Datas);'.format(key.to_field_name(), key.name, key.name), indent_depth + 4, formatting)
+            text += to_line('}', indent_depth + 3, formatting)
+            text += to_line('{}Datas.Add(data);'.format(key.name), indent_depth + 3, formatting)
+        text += to_line('}', indent_depth + 2, formatting)
+        text += to_line('}', indent_depth + 1, formatting)
+
+        # 기본 키 조회
+        text += formatting.line_sep
+        text += to_line('public {} GetBy{}({} {})'.format(data_type, primary_key.to_method_suffix(), primary_key.type, primary_key.name), indent_depth + 1, formatting)
+        text += to_line('{', indent_depth + 1, formatting)
+        text += to_line('return {}[{}];'.format(primary_key.to_field_name(), primary_key.name), indent_depth + 2, formatting)
+        text += to_line('}', indent_depth + 1, formatting)
+        text += formatting.line_sep
+        text += to_line('public bool TryGetBy{}({} {}, out {} data)'.format(primary_key.to_method_suffix(), primary_key.type, primary_key.name, data_type), indent_depth + 1, formatting)
+        text += to_line('{', indent_depth + 1, formatting)
+        text += to_line('return {}.TryGetValue({}, out data);'.format(primary_key.to_field_name(), primary_key.name), indent_depth + 2, formatting)
+        text += to_line('}', indent_depth + 1, formatting)
+
+        # 보조 키 조회. 없으면 빈 목록
+        for key in self.secondary_keys:
+            text += formatting.line_sep
+            text += to_line('public IReadOnlyList<{}> FindBy{}({} {})'.format(data_type, key.to_method_suffix(), key.type, key.name), indent_depth + 1, formatting)
+            text += to_line('{', indent_depth + 1, formatting)
+            text += to_line('List<{}> {}Datas;'.format(data_type, key.name), indent_depth + 2, formatting)
+            text += to_line('return {}.TryGetValue({}, out {}Datas) ? {}Datas : emptyDatas;'.format(key.to_field_name(), key.name, key.name, key.name), indent_depth + 2, formatting)
+            text += to_line('}', indent_depth + 1, formatting)
+
+        text += to_line('}', indent_depth, formatting)
+
+        return text
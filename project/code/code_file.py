@@ -7,10 +7,13 @@ class CodeFile:
     def __init__(self):
         self.name = ''
         self.blocks = [] # CodeBlock[]
+        self.usings = ['System.Collections.Generic']
         self.formatting = CodeFileFormatting()
     
     def to_code(self):
-        text = 'using System.Collections.Generic;' + self.formatting.line_sep
+        text = ''
+        for using in self.usings:
+            text += 'using {};'.format(using) + self.formatting.line_sep
         text += self.formatting.line_sep
 
         for idx, block in enumerate(self.blocks):
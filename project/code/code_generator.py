@@ -1,7 +1,9 @@
 import json
 import os
-from code.code_block import EnumCodeMember, EnumCodeBlock, ObjectCodeMember, ObjectCodeBlock
+from code.code_block import BinaryAssetReaderCodeBlock, EnumCodeMember, EnumCodeBlock, ObjectCodeMember, ObjectCodeBlock, TableIndexCodeBlock, TableIndexCodeKey
 from code.code_file import CodeFile
+from exporter.schema_dependency_graph import SchemaDependencyGraph
+from exporter.stage_profiler import NullProfileStage
 from jsonschema import Draft7Validator
 
 class CodeGeneratorConfig:
@@ -9,23 +11,88 @@ class CodeGeneratorConfig:
         self.schema_dir_path = config_json['schema_dir_path']
         self.code_dir_path = config_json['code_dir_path']
         self.code_prefix = config_json['code_prefix']
+        self.asset_format = config_json.get('asset_format', 'json')     # 'binary', 'both' 면 바이너리 어셋 읽기 코드도 생성
+
+    def reads_binary_asset(self):
+        return self.asset_format in ['binary', 'both']
 
 class CodeGenerator:
-    def __init__(self, config_json):
+    # @param profiler StageProfiler. 지정하면 스키마 파일별 단계 실행 시간, 메모리를 기록
+    def __init__(self, config_json, profiler=None):
         self.config = CodeGeneratorConfig(config_json)
         self.cached_file_schemas = {} # { 파일명 : 파일 스키마 }
+        self.schema_graph = SchemaDependencyGraph()
+        self.profiler = profiler
     
     def run(self):
-        for schema_file_name in os.listdir(self.config.schema_dir_path):
-            if schema_file_name.endswith('.json'):
+        with self.profile_stage('run', self.config.schema_dir_path):
+            for schema_file_name in self.find_schema_file_names():
                 #print(schema_file_name)
                 
+                self.generate_code_file(schema_file_name)
+
+            if self.config.reads_binary_asset():
+                self.write_code_file(self.create_binary_asset_reader_code_file())
+        
+        return
+
+    def find_schema_file_names(self):
+        return [file_name for file_name in os.listdir(self.config.schema_dir_path) if file_name.endswith('.json')]
+
+    def generate_code_file(self, schema_file_name):
+        with self.profile_stage('generate_code_file', schema_file_name):
+            with self.profile_stage('load_schema', schema_file_name):
                 file_schema = self.load_file_schema(schema_file_name)
+            with self.profile_stage('create_code_file', schema_file_name) as stage:
                 code_file = self.create_code_file(schema_file_name, file_schema)
+                stage.counts['blocks'] = len(code_file.blocks)
+            with self.profile_stage('write_code_file', schema_file_name):
                 self.write_code_file(code_file)
-        
-        return
+
+    def profile_stage(self, stage_name, schema_file_name):
+        if self.profiler is None:
+            return NullProfileStage()
+
+        return self.profiler.stage(stage_name, 'code', schema_file_name)
+
+    # 스키마 파일이 바뀌었을 때 캐시에서 제거
+    def invalidate_schema(self, schema_file_name):
+        self.cached_file_schemas.pop(schema_file_name, None)
+        self.schema_graph.remove_refs(schema_file_name)
+
+    # 모든 스키마 파일의 코드를 만들어 보며 스키마 참조 관계를 기록한다. 코드 파일은 쓰지 않음
+    def build_schema_graph(self):
+        for schema_file_name in self.find_schema_file_names():
+            file_schema = self.load_file_schema(schema_file_name)
+            self.create_code_file(schema_file_name, file_schema)
+
+        return self.schema_graph
+
+    # 바뀐 스키마 파일과 그 파일에 직/간접적으로 의존하는 스키마 파일명 목록
+    def find_dependent_schema_files(self, schema_file_names):
+        return self.schema_graph.find_dependents(schema_file_names)
+
+    # 예) Enum.schema.json -> DEEnum.generated.cs
+    def get_code_file_name(self, schema_file_name):
+        file_keyword = schema_file_name.split('.', 1)[0]
+        return '{}{}.generated.cs'.format(self.config.code_prefix, file_keyword)
     
+    # 생성된 테이블 클래스의 ReadFrom(), ReadTable() 이 사용하는 바이너리 어셋 읽기 클래스
+    def get_binary_asset_reader_name(self):
+        return '{}BinaryAssetReader'.format(self.config.code_prefix)
+
+    def create_binary_asset_reader_code_file(self):
+        code_file = CodeFile()
+        code_file.name = '{}.generated.cs'.format(self.get_binary_asset_reader_name())
+        code_file.usings = ['System', 'System.Text']
+
+        reader_code_block = BinaryAssetReaderCodeBlock()
+        reader_code_block.name = self.get_binary_asset_reader_name()
+        reader_code_block.comment = '바이너리 어셋(MessagePack 형식) 읽기'
+
+        code_file.blocks.append(reader_code_block)
+        return code_file
+
     def load_file_schema(self, schema_file_name):
         if schema_file_name in self.cached_file_schemas:
             return self.cached_file_schemas[schema_file_name]
@@ -44,11 +111,11 @@ class CodeGenerator:
     
     def create_code_file(self, schema_file_name, file_schema):
         context = CodeGenerateContext()
+        context.schema_file_name = schema_file_name
         code_file = CodeFile()
 
-        # 예) Enum.schema.json -> DEEnum.generated.cs
         file_keyword = schema_file_name.split('.', 1)[0]
-        code_file.name = '{}{}.generated.cs'.format(self.config.code_prefix, file_keyword)
+        code_file.name = self.get_code_file_name(schema_file_name)
         
         if 'definitions' in file_schema:
             for block_name, block_schema in file_schema['definitions'].items():
@@ -56,6 +123,14 @@ class CodeGenerator:
         
         self.parse_code_block(file_keyword, file_schema, context)
 
+        # 테이블 스키마 최상위 배열의 항목 클래스에는 어셋 전체를 읽는 함수와 키 조회 컨테이너 추가
+        if schema_file_name.endswith('.table.json') and file_schema.get('type') == 'array':
+            table_type_name = '{}{}'.format(self.config.code_prefix, CodeGenerator.block_path_to_type([file_keyword]))
+            for block in list(context.blocks):
+                if isinstance(block, ObjectCodeBlock) and block.name == table_type_name:
+                    block.is_table = True
+                    self.parse_table_index_code_block(block, file_schema['items'], context)
+
         code_file.blocks = context.blocks
         return code_file
     
@@ -96,8 +171,10 @@ class CodeGenerator:
         object_code_block.name = '{}{}'.format(self.config.code_prefix, CodeGenerator.block_path_to_type(context.current_block_path))
         object_code_block.comment = block_schema['description'] if 'description' in block_schema else ''
         object_code_block.is_struct = is_struct
+        if self.config.reads_binary_asset():
+            object_code_block.binary_reader_name = self.get_binary_asset_reader_name()
 
-        for object_property_name, object_property_schema in block_schema['properties'].items():
+        for object_property_idx, (object_property_name, object_property_schema) in enumerate(block_schema['properties'].items()):
             # Object property 가 block 화 가능하다면 수행
             self.parse_code_block(object_property_name, object_property_schema, context)
 
@@ -105,12 +182,60 @@ class CodeGenerator:
             object_member.name = object_property_name
             object_member.type, object_member.is_array = self.determine_block_member_type(object_property_name, object_property_schema, context)
             object_member.comment = object_property_schema['description'] if 'description' in object_property_schema else ''
+            object_member.index = object_property_idx
+            if self.config.reads_binary_asset():
+                object_member.read_kind = self.determine_block_member_read_kind(object_property_schema, context)
 
             object_code_block.members.append(object_member)
         
         context.blocks.append(object_code_block)
         context.pop_path()
     
+    # 테이블 키. 'x-index' 가 있으면 첫 항목이 기본 키, 나머지는 보조 키. 없으면 'id' 멤버가 기본 키
+    @staticmethod
+    def determine_table_index_keys(item_schema):
+        if 'x-index' in item_schema:
+            return item_schema['x-index']
+        elif 'id' in item_schema.get('properties', {}):
+            return ['id']
+        else:
+            return []
+
+    def parse_table_index_code_block(self, table_code_block, item_schema, context):
+        index_key_names = CodeGenerator.determine_table_index_keys(item_schema)
+        if len(index_key_names) == 0:
+            return
+
+        index_code_block = TableIndexCodeBlock()
+        index_code_block.name = table_code_block.name + 'Table'
+        index_code_block.comment = '{} 테이블 키 조회'.format(table_code_block.name)
+        index_code_block.data_type = table_code_block.name
+
+        for key_name in index_key_names:
+            key_member = None
+            for member in table_code_block.members:
+                if member.name == key_name:
+                    key_member = member
+
+            if key_member is None:
+                raise Exception('Index key is not a member! table: {}, key: {}'.format(table_code_block.name, key_name))
+
+            # 키는 값 하나인 기본 타입 또는 열거형만 가능
+            key_read_kind = self.determine_block_member_read_kind(item_schema['properties'][key_name], context)
+            if key_member.is_array or key_read_kind == 'object':
+                raise Exception('Not supported index key type! table: {}, key: {}'.format(table_code_block.name, key_name))
+
+            index_key = TableIndexCodeKey()
+            index_key.name = key_name
+            index_key.type = key_member.type
+
+            if index_code_block.primary_key is None:
+                index_code_block.primary_key = index_key
+            else:
+                index_code_block.secondary_keys.append(index_key)
+
+        context.blocks.append(index_code_block)
+
     def determine_block_member_type(self, property_name, property_schema, context):
         member_type = ''
         member_is_array = False
@@ -131,7 +256,7 @@ class CodeGenerator:
             elif item_type == 'string' and 'enum' in item_schema:
                 member_type = self.determine_object_block_member_type(property_name, item_schema, context)
             else:
-                member_type = self.determine_leaf_block_member_type(item_schema)
+                member_type = self.determine_leaf_block_member_type(item_schema, context)
         
         elif property_type == 'object':
             member_type = self.determine_object_block_member_type(property_name, property_schema, context)
@@ -140,11 +265,46 @@ class CodeGenerator:
             member_type = self.determine_object_block_member_type(property_name, property_schema, context)
 
         else:
-            member_type = self.determine_leaf_block_member_type(property_schema)
+            member_type = self.determine_leaf_block_member_type(property_schema, context)
         
         return member_type, member_is_array
     
-    def determine_leaf_block_member_type(self, property_schema):
+    # 바이너리 어셋에 기록된 값 유형. 참조 스키마는 따라가서 판단
+    # 열거형은 문자열 대신 enum 목록 인덱스로 기록됨
+    def determine_block_member_read_kind(self, property_schema, context):
+        if property_schema.get('type') == 'array':
+            property_schema = property_schema['items']
+
+        value_schema = self.resolve_ref_schema(property_schema, context.schema_file_name)
+        value_type = value_schema.get('type')
+
+        if value_type == 'string' and 'enum' in value_schema:
+            return 'enum'
+        elif value_type == 'object':
+            return 'object'
+        elif value_type == 'integer':
+            return 'int'
+        elif value_type == 'number':
+            return 'float'
+        elif value_type == 'boolean':
+            return 'bool'
+        elif value_type == 'string':
+            return 'string'
+        else:
+            raise Exception('Not supported binary asset value type! value_type: {}'.format(value_type))
+
+    def resolve_ref_schema(self, schema, current_schema_file_name):
+        while '$ref' in schema:
+            ref_uri = schema['$ref']
+            current_schema_file_name = CodeGenerator.ref_to_schema_file_name(ref_uri, current_schema_file_name)
+
+            schema = self.load_file_schema(current_schema_file_name)
+            for path in ref_uri.split('#')[1].split('/')[1:]:
+                schema = schema[path]
+
+        return schema
+
+    def determine_leaf_block_member_type(self, property_schema, context):
         type_name = ''
 
         if 'type' in property_schema:
@@ -162,6 +322,7 @@ class CodeGenerator:
         
         elif '$ref' in property_schema:
             type_name = '{}{}'.format(self.config.code_prefix, CodeGenerator.ref_to_type(property_schema['$ref']))
+            self.schema_graph.add_ref(context.schema_file_name, CodeGenerator.ref_to_schema_file_name(property_schema['$ref'], context.schema_file_name))
         
         else:
             raise Exception('Not supported leaf block member type!')
@@ -210,6 +371,13 @@ class CodeGenerator:
         
         return CodeGenerator.block_path_to_type(block_paths)
 
+    # ref_uri: Enum.schema.json#/definitions/dayOfWeek -> Enum.schema.json
+    # 같은 파일 내 참조(#/definitions/...)는 현재 스키마 파일명
+    @staticmethod
+    def ref_to_schema_file_name(ref_uri, current_schema_file_name):
+        ref_schema_file_name = ref_uri.split('#')[0]
+        return ref_schema_file_name if len(ref_schema_file_name) > 0 else current_schema_file_name
+
     def write_code_file(self, code_file):
         code_file_path = os.path.join(self.config.code_dir_path, code_file.name)
 
@@ -237,6 +405,7 @@ class CodeGenerator:
 
 class CodeGenerateContext:
     def __init__(self):
+        self.schema_file_name = ''  # 코드를 만드는 중인 스키마 파일명
         self.current_block_path = [] #예) ['ContentsOpenTime', 'structVal']
         self.blocks = [] # CodeBlock[]
     
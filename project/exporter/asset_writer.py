@@ -0,0 +1,49 @@
+import hashlib
+import os
+from exporter.export_manifest import ExportManifest
+
+# 레코드 단위로 어셋 파일을 쓰는 기록기
+# 임시 파일에 쓰면서 해시를 구하고, 내용이 기존 어셋과 다를 때만 교체한다.
+class AssetWriter:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.temp_file_path = file_path + '.tmp'
+        self.fp = None
+        self.hash = hashlib.sha256()
+        self.digest = None  # 닫은 후 파일 내용의 해시. ExportManifest.hash_file() 과 같은 값
+        self.record_offsets = None  # [바이트 위치] 레코드별 파일 안 시작 위치. 레코드 단위로 찾을 수 없는 형식은 None
+
+    def open(self):
+        raise Exception('AssetWriter.open() is abstract method!')
+
+    def write_record(self, record):
+        raise Exception('AssetWriter.write_record() is abstract method!')
+
+    def close(self):
+        raise Exception('AssetWriter.close() is abstract method!')
+
+    # 내용이 기존 어셋과 다를 때만 임시 파일로 교체한다.
+    # @return 'Written' or 'Skipped'
+    def commit(self):
+        old_digest = None
+
+        try:
+            old_digest = ExportManifest.hash_file(self.file_path)
+        except FileNotFoundError:
+            pass
+
+        if old_digest != self.digest:
+            os.replace(self.temp_file_path, self.file_path)
+            return 'Written'
+        else:
+            os.remove(self.temp_file_path)
+            return 'Skipped'
+
+    # 쓰는 도중 실패했을 때 임시 파일 제거
+    def discard(self):
+        if self.fp is not None:
+            self.fp.close()
+            self.fp = None
+
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
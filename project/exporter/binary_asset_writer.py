@@ -0,0 +1,191 @@
+import os
+import struct
+from exporter.asset_writer import AssetWriter
+from exporter.type_node import TypeNodeParseType
+
+# 레코드를 MessagePack 형식으로 쓰는 어셋 기록기
+# JSON 어셋과 같은 구조이나 공백이 없고 필드명 대신 스키마 정의 순서의 멤버 인덱스를 키로 쓴다.
+#  - 최상위: 레코드 배열. 레코드가 없으면 nil (JSON 어셋의 null 과 같음)
+#  - 오브젝트: { 멤버 인덱스 : 값 } 맵. 값이 없는 멤버는 생략
+#  - 열거형 문자열: 스키마 enum 목록의 인덱스 (C# 열거형 값과 같음)
+#  - 실수: float64
+# 코드 생성기가 만드는 C# ReadFrom() 함수가 이 형식을 읽는다.
+#
+# 배열 헤더 길이가 레코드 수에 따라 달라지므로 레코드는 본문 임시 파일에 바로 쓰고,
+# 닫을 때 배열 헤더를 쓴 뒤 본문을 이어 붙이면서 해시를 구한다. 메모리에는 레코드 하나만 둔다.
+class BinaryAssetWriter(AssetWriter):
+    COPY_BYTES = 64 * 1024
+
+    def __init__(self, file_path, type_info_root):
+        super().__init__(file_path)
+        self.type_info_root = type_info_root
+        self.body_file_path = file_path + '.body.tmp'   # 배열 헤더를 뺀 레코드 배열 내용
+        self.body_fp = None
+        self.body_size = 0
+        self.buffer = bytearray()   # 쓰는 중인 레코드 내용
+        self.record_count = 0
+        self.record_offsets = []
+        self.member_entries = {}    # { id(TypeNode) : [(필드명, 멤버 인덱스, TypeNode, 열거형 인덱스)] }
+
+    def open(self):
+        self.body_fp = open(self.body_file_path, 'wb')
+
+    def write_record(self, record):
+        self.record_offsets.append(self.body_size)
+        self.pack_object(self.type_info_root, record)
+
+        self.body_fp.write(self.buffer)
+        self.body_size += len(self.buffer)
+        self.buffer.clear()
+        self.record_count += 1
+
+    def close(self):
+        self.body_fp.close()
+        self.body_fp = None
+
+        header = bytearray()
+        if self.record_count == 0:
+            header.append(0xc0)
+        else:
+            BinaryAssetWriter.pack_array_header(header, self.record_count)
+
+        # 레코드 위치는 배열 헤더를 쓰기 전의 내용 기준이었음
+        for record_idx in range(len(self.record_offsets)):
+            self.record_offsets[record_idx] += len(header)
+
+        self.fp = open(self.temp_file_path, 'wb')
+        self.write_bytes(header)
+        with open(self.body_file_path, 'rb') as body_fp:
+            for chunk in iter(lambda: body_fp.read(BinaryAssetWriter.COPY_BYTES), b''):
+                self.write_bytes(chunk)
+
+        self.fp.close()
+        self.fp = None
+        os.remove(self.body_file_path)
+        self.digest = self.hash.hexdigest()
+
+    def discard(self):
+        if self.body_fp is not None:
+            self.body_fp.close()
+            self.body_fp = None
+
+        if os.path.exists(self.body_file_path):
+            os.remove(self.body_file_path)
+
+        super().discard()
+
+    def write_bytes(self, data):
+        self.fp.write(data)
+        self.hash.update(data)
+
+    # 오브젝트 노드의 멤버 목록. 타입 노드마다 한 번만 만든다.
+    # @return [(필드명, 멤버 인덱스, TypeNode, { 열거형 문자열 : 인덱스 } 또는 None)]
+    def get_member_entries(self, type_node):
+        entries = self.member_entries.get(id(type_node))
+        if entries is not None:
+            return entries
+
+        entries = []
+        for member_idx, member in enumerate(type_node.members):
+            enum_indexes = None
+            if member.parse_type == TypeNodeParseType.STRING and member.constraint is not None and member.constraint.enum is not None:
+                enum_indexes = { enum_value: enum_idx for enum_idx, enum_value in enumerate(member.constraint.enum) }
+
+            entries.append((member.name, member_idx, member, enum_indexes))
+
+        self.member_entries[id(type_node)] = entries
+        return entries
+
+    def pack_object(self, type_node, data):
+        values = []
+        for name, member_idx, member, enum_indexes in self.get_member_entries(type_node):
+            value = data.get(name)
+            if value is not None:
+                values.append((member_idx, member, enum_indexes, value))
+
+        BinaryAssetWriter.pack_map_header(self.buffer, len(values))
+        for member_idx, member, enum_indexes, value in values:
+            BinaryAssetWriter.pack_int(self.buffer, member_idx)
+
+            if member.is_array:
+                BinaryAssetWriter.pack_array_header(self.buffer, len(value))
+                for item in value:
+                    self.pack_value(member, enum_indexes, item)
+            else:
+                self.pack_value(member, enum_indexes, value)
+
+    def pack_value(self, type_node, enum_indexes, value):
+        if not type_node.is_leaf():
+            self.pack_object(type_node, value)
+        elif enum_indexes is not None:
+            if not value in enum_indexes:
+                raise Exception('Invalid enum value to write binary asset. field:{}, value:{!r}'.format(type_node.name, value))
+            BinaryAssetWriter.pack_int(self.buffer, enum_indexes[value])
+        elif type_node.parse_type == TypeNodeParseType.INT:
+            BinaryAssetWriter.pack_int(self.buffer, value)
+        elif type_node.parse_type == TypeNodeParseType.FLOAT:
+            self.buffer += struct.pack('>Bd', 0xcb, value)
+        elif type_node.parse_type == TypeNodeParseType.BOOL:
+            self.buffer.append(0xc3 if value else 0xc2)
+        elif type_node.parse_type == TypeNodeParseType.STRING:
+            BinaryAssetWriter.pack_string(self.buffer, value)
+        else:
+            raise Exception('Invalid type to write binary asset. field:{}, parse_type:{}'.format(type_node.name, type_node.parse_type))
+
+    # 값 범위에 맞는 가장 짧은 정수 형식
+    @staticmethod
+    def pack_int(buffer, value):
+        if 0 <= value <= 0x7f:
+            buffer.append(value)
+        elif -32 <= value < 0:
+            buffer.append(value & 0xff)
+        elif 0 <= value <= 0xff:
+            buffer += struct.pack('>BB', 0xcc, value)
+        elif 0 <= value <= 0xffff:
+            buffer += struct.pack('>BH', 0xcd, value)
+        elif 0 <= value <= 0xffffffff:
+            buffer += struct.pack('>BI', 0xce, value)
+        elif 0 <= value:
+            buffer += struct.pack('>BQ', 0xcf, value)
+        elif -0x80 <= value:
+            buffer += struct.pack('>Bb', 0xd0, value)
+        elif -0x8000 <= value:
+            buffer += struct.pack('>Bh', 0xd1, value)
+        elif -0x80000000 <= value:
+            buffer += struct.pack('>Bi', 0xd2, value)
+        else:
+            buffer += struct.pack('>Bq', 0xd3, value)
+
+    @staticmethod
+    def pack_string(buffer, value):
+        encoded = value.encode('utf8')
+        size = len(encoded)
+
+        if size <= 31:
+            buffer.append(0xa0 | size)
+        elif size <= 0xff:
+            buffer += struct.pack('>BB', 0xd9, size)
+        elif size <= 0xffff:
+            buffer += struct.pack('>BH', 0xda, size)
+        else:
+            buffer += struct.pack('>BI', 0xdb, size)
+
+        buffer += encoded
+
+    @staticmethod
+    def pack_array_header(buffer, size):
+        if size <= 15:
+            buffer.append(0x90 | size)
+        elif size <= 0xffff:
+            buffer += struct.pack('>BH', 0xdc, size)
+        else:
+            buffer += struct.pack('>BI', 0xdd, size)
+
+    @staticmethod
+    def pack_map_header(buffer, size):
+        if size <= 15:
+            buffer.append(0x80 | size)
+        elif size <= 0xffff:
+            buffer += struct.pack('>BH', 0xde, size)
+        else:
+            buffer += struct.pack('>BI', 0xdf, size)
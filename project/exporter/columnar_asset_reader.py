@@ -0,0 +1,189 @@
+import json
+import mmap
+import struct
+import sys
+from exporter.columnar_asset_writer import ColumnarAssetWriter
+
+# 컬럼형 어셋 값 버퍼 형식
+COLUMNAR_VALUE_FORMATS = {
+    'int': 'q',
+    'float': 'd',
+    'bool': '?',
+}
+
+# 문자열 컬럼. 인덱스로 접근할 때 해당 값만 디코딩한다.
+class ColumnarStrings:
+    def __init__(self, value_offsets, values):
+        self.value_offsets = value_offsets  # memoryview('q') 각 값의 시작 위치. 마지막은 끝 위치
+        self.values = values    # memoryview('B') UTF-8 바이트
+
+    def __len__(self):
+        return len(self.value_offsets) - 1
+
+    def __getitem__(self, idx):
+        return str(self.raw(idx), 'utf8')
+
+    # 복사하지 않은 UTF-8 바이트
+    def raw(self, idx):
+        return self.values[self.value_offsets[idx]:self.value_offsets[idx + 1]]
+
+# 컬럼형 어셋의 필드 하나. 버퍼는 모두 메모리 맵을 가리키는 memoryview
+class ColumnarField:
+    def __init__(self, name, path, value_type, is_array):
+        self.name = name
+        self.path = path    # 최상위부터 '.' 으로 이은 필드명
+        self.type = value_type  # 'int', 'float', 'bool', 'string', 'object'
+        self.is_array = is_array
+        self.validity = None    # memoryview('B') 부모 항목별 값 유무
+        self.offsets = None     # memoryview('q') 배열: 부모 항목별 배열 항목 범위
+        self.values = None      # 리프: memoryview 또는 ColumnarStrings
+        self.members = []   # [ColumnarField]
+
+    def is_leaf(self):
+        return self.type != 'object'
+
+    # 부모 항목 하나의 값. 값이 없으면 None
+    def read(self, idx):
+        if not self.validity[idx]:
+            return None
+
+        if self.is_array:
+            item_range = range(self.offsets[idx], self.offsets[idx + 1])
+            return [self.read_item(item_idx) for item_idx in item_range]
+        else:
+            return self.read_item(idx)
+
+    def read_item(self, idx):
+        if self.is_leaf():
+            return self.values[idx]
+
+        return ColumnarField.read_members(self.members, idx)
+
+    @staticmethod
+    def read_members(fields, idx):
+        data = {}
+
+        for field in fields:
+            value = field.read(idx)
+            if value is not None:
+                data[field.name] = value
+
+        return data
+
+# ColumnarAssetWriter 가 쓴 어셋을 메모리 맵으로 열어 읽는 리더
+# column() 은 파일 내용을 복사하지 않은 memoryview 를 돌려주며, close() 후에는 사용할 수 없다.
+class ColumnarAssetReader:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.fp = None
+        self.mmap = None
+        self.views = []     # [memoryview] close() 때 해제할 메모리 맵 참조
+        self.record_count = 0
+        self.fields = []    # [ColumnarField]
+        self.fields_by_path = {}    # { 필드 경로 : ColumnarField }
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        # memoryview 형식 변환은 기기 바이트 순서를 따르므로 리틀 엔디언에서만 그대로 읽을 수 있음
+        if sys.byteorder != 'little':
+            raise Exception('Columnar asset requires little endian machine. file:{}'.format(self.file_path))
+
+        self.fp = open(self.file_path, 'rb')
+        self.mmap = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic_size = len(ColumnarAssetWriter.MAGIC)
+        if self.mmap[:magic_size] != ColumnarAssetWriter.MAGIC:
+            self.close()
+            raise Exception('Invalid columnar asset. file:{}'.format(self.file_path))
+
+        header_size, = struct.unpack_from('<Q', self.mmap, magic_size)
+        header_start = magic_size + 8
+        header = json.loads(self.mmap[header_start:header_start + header_size].decode('utf8'))
+
+        if header['version'] != ColumnarAssetWriter.VERSION:
+            self.close()
+            raise Exception('Unsupported columnar asset version. file:{}, version:{}'.format(self.file_path, header['version']))
+
+        data_start = ColumnarAssetWriter.align(header_start + header_size)
+        self.record_count = header['record_count']
+        self.fields = [self.create_field(field_header, '', data_start) for field_header in header['fields']]
+
+    def close(self):
+        for view in self.views:
+            view.release()
+        self.views = []
+
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+
+        if self.fp is not None:
+            self.fp.close()
+            self.fp = None
+
+    def create_field(self, field_header, parent_path, data_start):
+        path = parent_path + field_header['name']
+        field = ColumnarField(field_header['name'], path, field_header['type'], field_header['is_array'])
+        buffers = field_header['buffers']
+
+        field.validity = self.create_view(buffers['validity'], data_start, 'B')
+        if field.is_array:
+            field.offsets = self.create_view(buffers['offsets'], data_start, 'q')
+
+        if field.type == 'string':
+            value_offsets = self.create_view(buffers['value_offsets'], data_start, 'q')
+            field.values = ColumnarStrings(value_offsets, self.create_view(buffers['values'], data_start, 'B'))
+        elif field.type != 'object':
+            field.values = self.create_view(buffers['values'], data_start, COLUMNAR_VALUE_FORMATS[field.type])
+
+        self.fields_by_path[path] = field
+        for member_header in field_header['members']:
+            field.members.append(self.create_field(member_header, path + '.', data_start))
+
+        return field
+
+    # @param buffer_range [데이터 영역 안의 위치, 바이트 수]
+    def create_view(self, buffer_range, data_start, value_format):
+        offset, size = buffer_range
+        start = data_start + offset
+
+        byte_view = memoryview(self.mmap)[start:start + size]
+        view = byte_view.cast(value_format)
+        byte_view.release()
+
+        self.views.append(view)
+        return view
+
+    def __len__(self):
+        return self.record_count
+
+    def __iter__(self):
+        for idx in range(self.record_count):
+            yield self.record(idx)
+
+    # JSON 어셋의 레코드와 같은 형태의 dict
+    def record(self, idx):
+        if idx < 0 or idx >= self.record_count:
+            raise IndexError('Record index out of range. idx:{}'.format(idx))
+
+        return ColumnarField.read_members(self.fields, idx)
+
+    def field(self, path):
+        if not path in self.fields_by_path:
+            raise KeyError('Invalid field path. path:{}'.format(path))
+
+        return self.fields_by_path[path]
+
+    # 리프 필드의 값 버퍼. 배열이면 모든 배열 항목이 이어져 있음 (field(path).offsets 로 구분)
+    def column(self, path):
+        field = self.field(path)
+        if not field.is_leaf():
+            raise Exception('Not a leaf field. path:{}'.format(path))
+
+        return field.values
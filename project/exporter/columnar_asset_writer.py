@@ -0,0 +1,165 @@
+import json
+import struct
+import sys
+from array import array
+from exporter.asset_writer import AssetWriter
+from exporter.type_node import TypeNodeParseType
+
+# 리프 파싱 유형별 값 버퍼 형식. 문자열은 오프셋 버퍼와 UTF-8 바이트 버퍼로 나눠 기록
+COLUMNAR_VALUE_TYPES = {
+    TypeNodeParseType.INT: ('int', 'q'),
+    TypeNodeParseType.FLOAT: ('float', 'd'),
+    TypeNodeParseType.BOOL: ('bool', 'B'),
+    TypeNodeParseType.STRING: ('string', None),
+}
+
+# 타입 정보 노드 하나의 컬럼 버퍼를 모으는 빌더
+# 부모 항목(최상위는 레코드) 하나마다 validity 에 값 유무를 하나씩 추가한다.
+#  - 배열: offsets[i] ~ offsets[i + 1] 이 i 번째 부모 항목의 배열 항목 범위
+#  - 리프: 값 버퍼. 배열이면 배열 항목마다, 아니면 부모 항목마다 하나 (값이 없으면 0)
+#  - 구조체: 멤버 빌더. 배열이면 배열 항목을, 아니면 부모 항목을 부모로 삼음
+class ColumnarFieldBuilder:
+    def __init__(self, type_node):
+        self.name = type_node.name
+        self.is_array = type_node.is_array
+        self.validity = bytearray()
+        self.offsets = array('q', [0]) if type_node.is_array else None
+        self.value_type = None
+        self.values = None
+        self.value_offsets = None   # 문자열: values 안에서 각 값의 시작 위치. 마지막은 끝 위치
+        self.members = [ColumnarFieldBuilder(member) for member in type_node.members]  # [ColumnarFieldBuilder]
+
+        if type_node.is_leaf():
+            if not type_node.parse_type in COLUMNAR_VALUE_TYPES:
+                raise Exception('Invalid type to write columnar asset. field:{}, parse_type:{}'.format(type_node.name, type_node.parse_type))
+
+            self.value_type, type_code = COLUMNAR_VALUE_TYPES[type_node.parse_type]
+            if type_code is None:
+                self.values = bytearray()
+                self.value_offsets = array('q', [0])
+            else:
+                self.values = array(type_code)
+
+    def append(self, value):
+        self.validity.append(0 if value is None else 1)
+
+        if self.is_array:
+            items = value if value is not None else []
+            for item in items:
+                self.append_item(item)
+            self.offsets.append(self.offsets[-1] + len(items))
+        else:
+            self.append_item(value)
+
+    def append_item(self, value):
+        if self.value_type is None:
+            for member in self.members:
+                member.append(value.get(member.name) if value is not None else None)
+        elif self.value_type == 'string':
+            if value is not None:
+                self.values += value.encode('utf8')
+            self.value_offsets.append(len(self.values))
+        elif self.value_type == 'bool':
+            self.values.append(1 if value else 0)
+        else:
+            self.values.append(value if value is not None else 0)
+
+    # 버퍼를 목록에 추가하고 헤더에 기록할 필드 정보를 만든다.
+    def describe(self, add_buffer):
+        buffers = {
+            'validity': add_buffer(self.validity)
+        }
+
+        if self.is_array:
+            buffers['offsets'] = add_buffer(self.offsets)
+        if self.value_offsets is not None:
+            buffers['value_offsets'] = add_buffer(self.value_offsets)
+        if self.values is not None:
+            buffers['values'] = add_buffer(self.values)
+
+        return {
+            'name': self.name,
+            'type': self.value_type if self.value_type is not None else 'object',
+            'is_array': self.is_array,
+            'buffers': buffers,
+            'members': [member.describe(add_buffer) for member in self.members]
+        }
+
+# 테이블을 컬럼별 연속 버퍼로 저장하는 어셋 기록기
+# 읽는 쪽은 파일을 메모리 맵으로 열어 파싱 없이 버퍼를 바로 쓸 수 있다. (ColumnarAssetReader)
+#
+# 파일 구성 (리틀 엔디언)
+#  - MAGIC (8바이트), 헤더 길이 (uint64)
+#  - 헤더: JSON. 레코드 수와 필드 트리, 필드별 버퍼 [데이터 영역 안의 위치, 바이트 수]
+#  - 데이터 영역: 8바이트 정렬된 버퍼들. 헤더 끝을 8바이트 정렬한 위치부터 시작
+class ColumnarAssetWriter(AssetWriter):
+    MAGIC = b'DECOLS\x00\x00'
+    VERSION = 1
+    ALIGNMENT = 8
+
+    def __init__(self, file_path, type_info_root):
+        super().__init__(file_path)
+        self.fields = [ColumnarFieldBuilder(member) for member in type_info_root.members]  # [ColumnarFieldBuilder]
+        self.record_count = 0
+
+    def open(self):
+        self.fp = open(self.temp_file_path, 'wb')
+
+    # 버퍼는 닫을 때 한 번에 쓰므로 여기서는 컬럼별로 모으기만 한다.
+    def write_record(self, record):
+        for field in self.fields:
+            field.append(record.get(field.name))
+        self.record_count += 1
+
+    def close(self):
+        buffers = []
+        data_size = 0
+
+        def add_buffer(buffer):
+            nonlocal data_size
+            offset = ColumnarAssetWriter.align(data_size)
+            size = memoryview(buffer).nbytes
+            buffers.append((offset, ColumnarAssetWriter.to_little_endian(buffer)))
+            data_size = offset + size
+            return [offset, size]
+
+        header = {
+            'version': ColumnarAssetWriter.VERSION,
+            'record_count': self.record_count,
+            'fields': [field.describe(add_buffer) for field in self.fields]
+        }
+        header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf8')
+
+        self.write_bytes(ColumnarAssetWriter.MAGIC)
+        self.write_bytes(struct.pack('<Q', len(header_bytes)))
+        self.write_bytes(header_bytes)
+
+        self.write_padding(len(ColumnarAssetWriter.MAGIC) + 8 + len(header_bytes))
+
+        position = 0
+        for offset, buffer in buffers:
+            self.write_bytes(bytes(offset - position))
+            self.write_bytes(buffer)
+            position = offset + memoryview(buffer).nbytes
+
+        self.fp.close()
+        self.fp = None
+        self.digest = self.hash.hexdigest()
+
+    def write_padding(self, size):
+        self.write_bytes(bytes(ColumnarAssetWriter.align(size) - size))
+
+    def write_bytes(self, data):
+        self.fp.write(data)
+        self.hash.update(data)
+
+    @staticmethod
+    def align(size):
+        return (size + ColumnarAssetWriter.ALIGNMENT - 1) // ColumnarAssetWriter.ALIGNMENT * ColumnarAssetWriter.ALIGNMENT
+
+    @staticmethod
+    def to_little_endian(buffer):
+        if isinstance(buffer, array) and sys.byteorder != 'little':
+            buffer = array(buffer.typecode, buffer)
+            buffer.byteswap()
+        return buffer
@@ -1,49 +1,345 @@
 import json
 import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from exporter.binary_asset_writer import BinaryAssetWriter
+from exporter.columnar_asset_writer import ColumnarAssetWriter
+from exporter.data_sheet import DataSheet
+from exporter.decode_plan import DecodePlan, DecodeStep
+from exporter.export_manifest import ExportManifest
 from exporter.header_node import HeaderNode
+from exporter.json_asset_writer import JsonAssetWriter
 from exporter.loaded_node_object_info import LoadedNodeObjectInfo
+from exporter.schema_dependency_graph import SchemaDependencyGraph
+from exporter.sheet_cache import SheetCache
+from exporter.sort_index_writer import SortIndexWriter
+from exporter.stage_profiler import NullProfileStage, StageProfiler
+from exporter.table_export_result import TableExportResult
+from exporter.table_profiler import TableProfiler
 from exporter.type_node import TypeNode, TypeNodeParseType
+from exporter.value_constraint import ValueConstraint
+from exporter.xlsx_sheet_reader import XlsxSheetReader
 from jsonschema import Draft7Validator, RefResolver
 from openpyxl import load_workbook
 
+PARSE_FAILED = object()     # parse_column() 에서 변환에 실패한 셀 표시
+
 class DataExporterConfig:
     def __init__(self, config_json):
         self.schema_dir_path = config_json['schema_dir_path']
         self.table_dir_path = config_json['table_dir_path']
         self.asset_dir_path = config_json['asset_dir_path']
+        self.jobs = config_json.get('jobs', 1)  # 동시에 내보낼 테이블 수. 2 이상이면 프로세스 풀 사용
+        self.force = config_json.get('force', False)    # True: 매니페스트 무시하고 모든 테이블 내보내기
+        self.strict = config_json.get('strict', False)  # True: 행 단위 검사 외에 jsonschema 전체 검사도 수행
+        self.sheet_cache_dir_path = config_json.get('sheet_cache_dir_path') # 읽은 시트를 보관할 디렉토리. 없으면 캐시 사용 안 함
+        self.sheet_cache_max_bytes = config_json.get('sheet_cache_max_bytes', 256 * 1024 * 1024)   # 시트 캐시 최대 크기
+        self.fast_sheet_reader = config_json.get('fast_sheet_reader', True)    # False: 셀 값을 항상 openpyxl 로 읽기
+        self.sheet_read_jobs = config_json.get('sheet_read_jobs', 1)    # 큰 시트의 행 묶음을 동시에 파싱할 프로세스 수. jobs 가 1 일 때만 사용
+        self.asset_format = config_json.get('asset_format', 'json')     # 'json', 'binary'(MessagePack), 'both'
+        self.columnar_asset = config_json.get('columnar_asset', False)  # True: JSON 어셋 옆에 컬럼형 바이너리 어셋(.columns)도 쓰기
+        self.profile_tables = config_json.get('profile_tables', [])     # 함수 단위 프로파일을 남길 테이블명 목록
+        self.profile_dir_path = config_json.get('profile_dir_path', 'profile')  # 테이블 프로파일 파일을 쓸 디렉토리
+        self.profile_mode = config_json.get('profile_mode', 'cprofile')     # 'cprofile', 'sample'(호출 스택 샘플)
+
+        if not self.asset_format in ['json', 'binary', 'both']:
+            raise Exception('Invalid asset_format: {}'.format(self.asset_format))
+        if not self.profile_mode in ['cprofile', 'sample']:
+            raise Exception('Invalid profile_mode: {}'.format(self.profile_mode))
+
+    def writes_json_asset(self):
+        return self.asset_format in ['json', 'both']
+
+    def writes_binary_asset(self):
+        return self.asset_format in ['binary', 'both']
 
 class DataExporter:
-    def __init__(self, config_json):
+    # @param profiler StageProfiler. 지정하면 테이블별 단계 실행 시간, 메모리, 처리량을 기록
+    def __init__(self, config_json, profiler=None):
+        self.config_json = config_json
         self.config = DataExporterConfig(config_json)
         self.cached_schemas = {} # { 파일명 : 스키마 }
+        self.cached_schema_stats = {}   # { 파일명 : (수정 시각, 크기) } 캐시에 넣을 때의 스키마 파일 상태
+        self.schema_graph = SchemaDependencyGraph()
+        self.cached_validators = {} # { 파일명 : 테이블 데이터 검사기 }
+        self.schema_resolver = self.create_schema_resolver()
+        self.manifest = ExportManifest(self.config.asset_dir_path)
+        self.manifest.load()
+        self.sheet_cache = DataExporter.create_sheet_cache(self.config)
+        self.profiler = profiler
     
     def run(self):
+        self.export_tables(self.find_table_names())
+
+    def export_tables(self, table_names):
+        # 실패하더라도 그 전까지 내보낸 테이블은 매니페스트에 남긴다.
+        try:
+            if self.config.jobs > 1:
+                self.export_tables_parallel(table_names)
+            else:
+                for table_name in table_names:
+                    result = self.export_table_reporting_failure(table_name)
+                    self.complete_export_result(result)
+        finally:
+            self.manifest.save()
+
+    # 출력 순서가 파일 시스템에 따라 달라지지 않도록 이름순 정렬
+    def find_table_names(self):
+        table_names = []
+
         for schema_file_name in os.listdir(self.config.schema_dir_path):
             if schema_file_name.endswith('.table.json'):
-                table_name = schema_file_name.split('.', 1)[0]
-                #print(table_name)
+                table_names.append(schema_file_name.split('.', 1)[0])
+
+        return sorted(table_names)
+
+    # 테이블마다 워커 프로세스에서 내보내고 결과는 테이블 순서대로 출력한다.
+    # 테이블 순서상 처음 실패한 테이블을 알리고 예외를 다시 던진다.
+    def export_tables_parallel(self, table_names):
+        profiles = self.profiler is not None
+        traces_memory = profiles and self.profiler.traces_memory
+        with ProcessPoolExecutor(max_workers=self.config.jobs, initializer=_init_export_worker, initargs=(self.config_json, profiles, traces_memory)) as executor:
+            futures = [executor.submit(_export_table_in_worker, table_name) for table_name in table_names]
+
+            for table_name, future in zip(table_names, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    for remaining_future in futures:
+                        remaining_future.cancel()
+                    print('Exception on export_table(). table_name:{}'.format(table_name))
+                    raise e
+
+                self.complete_export_result(result)
+
+    def export_table_reporting_failure(self, table_name):
+        try:
+            return self.export_table(table_name)
+        except Exception as e:
+            print('Exception on export_table(). table_name:{}'.format(table_name))
+            raise e
+
+    def complete_export_result(self, result):
+        self.apply_export_result(result)
+        DataExporter.print_export_result(result)
 
-                self.export_table(table_name)
+    @staticmethod
+    def print_export_result(result):
+        for asset_file_path, write_status in result.asset_write_statuses.items():
+            print('{}: {}'.format(asset_file_path, write_status))
+        for profile_file_path in result.profile_file_paths:
+            print('{}: Profiled'.format(profile_file_path))
     
+    # 결과를 매니페스트와 기록기에 반영한다. 출력은 하지 않음
+    def apply_export_result(self, result):
+        if result.manifest_entry is not None:
+            self.manifest.set_entry(result.table_name, result.manifest_entry)
+        if self.profiler is not None:
+            self.profiler.add_events(result.profile_events)
+
+    # 빌드 서비스처럼 오래 떠 있는 프로세스에서 여러 테이블을 내보낼 때 쓰는 API
+    # 출력하지 않고 테이블마다 TableExportResult 를 돌려주며, 한 테이블이 실패해도 나머지를 계속 내보낸다.
+    # 스키마, 검사기 캐시는 이 DataExporter 가 살아 있는 동안 배치 사이에도 재사용하고,
+    # 배치를 시작할 때 파일이 바뀐 스키마만 캐시에서 제거한다.
+    # 설정의 jobs 와 관계없이 이 프로세스에서 차례로 내보낸다.
+    # @param table_names [테이블명]. 요청이 올 때마다 테이블명을 꺼내주는 제너레이터도 됨
+    # @param on_result 테이블 하나가 끝날 때마다 TableExportResult 를 받는 함수
+    # @return [TableExportResult] 요청 순서
+    def export_batch(self, table_names, on_result=None):
+        results = []
+
+        for result in self.iter_export_results(table_names):
+            if on_result is not None:
+                on_result(result)
+            results.append(result)
+
+        return results
+
+    # export_batch() 와 같지만 테이블이 끝날 때마다 결과를 하나씩 돌려주는 제너레이터
+    def iter_export_results(self, table_names):
+        self.refresh_schema_cache()
+
+        for table_name in table_names:
+            result = self.export_table_capturing_failure(table_name)
+            self.apply_export_result(result)
+
+            # 요청이 계속 이어져도 끝난 테이블은 매니페스트에 남도록 테이블마다 저장
+            if result.manifest_entry is not None:
+                self.manifest.save()
+
+            yield result
+
+    # 실패하면 예외를 담은 결과를 돌려준다. 걸린 시간과, 기록기가 있으면 단계별 시간을 기록한다.
+    def export_table_capturing_failure(self, table_name):
+        event_count = len(self.profiler.events) if self.profiler is not None else 0
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        try:
+            result = self.export_table(table_name)
+        except Exception as e:
+            result = TableExportResult(table_name)
+            result.error = e
+            result.error_traceback = traceback.format_exc()
+            # 실패한 테이블의 시트, 레코드를 프레임 참조로 붙잡고 있지 않도록 끊는다.
+            e.__traceback__ = None
+
+        result.seconds = time.perf_counter() - wall_start
+        result.cpu_seconds = time.process_time() - cpu_start
+
+        if self.profiler is not None:
+            for event in self.profiler.events[event_count:]:
+                if event['target'] == table_name:
+                    result.stage_seconds[event['name']] = result.stage_seconds.get(event['name'], 0) + event['wall_seconds']
+
+        return result
+
     def export_table(self, table_name):
+        with self.profile_stage('export_table', table_name):
+            if not table_name in self.config.profile_tables:
+                return self.export_table_stages(table_name)
+
+            table_profiler = TableProfiler(self.config.profile_dir_path, table_name, self.config.profile_mode)
+            result = table_profiler.run(self.export_table_stages, table_name)
+            result.profile_file_paths = [table_profiler.get_output_file_path()]
+            return result
+
+    def export_table_stages(self, table_name):
         schema_file_name = table_name + '.table.json'
-        schema = self.load_schema(schema_file_name, True)
+        with self.profile_stage('load_schema', table_name):
+            schema = self.load_schema(schema_file_name, True)
 
-        type_info_root = self.create_type_info(schema, schema_file_name)
+        with self.profile_stage('create_type_info', table_name):
+            type_info_root = self.create_type_info(schema, schema_file_name)
         #print(str(type_info_root))
 
-        data = self.read_table(type_info_root, table_name)
-        #print(data)
+        # 입력 파일이 지난 내보내기 때와 같다면 엑셀을 열지 않는다.
+        with self.profile_stage('check_manifest', table_name):
+            asset_file_paths = self.get_asset_file_paths(type_info_root, table_name)
+            input_hashes, input_stats = self.hash_table_inputs(table_name, schema_file_name)
+            # 프로파일할 테이블은 건너뛰지 않음
+            forces = self.config.force or table_name in self.config.profile_tables
+            up_to_date_entry = None if forces else self.manifest.find_up_to_date_entry(table_name, input_hashes, input_stats, asset_file_paths, self.config.strict)
+
+        if up_to_date_entry is not None:
+            result = TableExportResult(table_name)
+            for asset_file_path in asset_file_paths:
+                result.asset_write_statuses[asset_file_path] = 'Skipped'
+            # 체크아웃 등으로 수정 시각만 바뀐 파일은 다음 번에 다시 해시하지 않도록 기록을 갱신
+            if up_to_date_entry != self.manifest.find_entry(table_name):
+                result.manifest_entry = up_to_date_entry
+            return result
+
+        # 필수 멤버, 값 제약, id 중복은 행을 읽으면서 검사한다.
+        # 레코드 단위로 읽기, 검사, 쓰기가 이어지므로 테이블 전체 데이터를 메모리에 모으지 않는다.
+        datas = self.read_table(type_info_root, table_name)
+
+        # 정렬과 jsonschema 전체 검사는 데이터 전체가 필요함
+        if type_info_root.sort_key is not None:
+            with self.profile_stage('sort', table_name):
+                datas = DataExporter.sort_datas(datas, type_info_root)
+        if self.config.strict:
+            with self.profile_stage('validate', table_name):
+                datas = list(datas) or None
+                self.validate_table_data(datas, schema_file_name)
+
+        with self.profile_stage('write_asset', table_name):
+            result = self.write_asset(datas, type_info_root, table_name)
+        asset_stats = ExportManifest.stat_files(result.asset_write_statuses)
+        result.manifest_entry = ExportManifest.create_entry(input_hashes, input_stats, result.asset_digests, asset_stats, self.config.strict)
+        return result
+
+    # 측정하지 않을 때도 같은 코드로 단계를 나눌 수 있도록 빈 단계를 돌려준다.
+    def profile_stage(self, stage_name, table_name):
+        if self.profiler is None:
+            return NullProfileStage()
+
+        return self.profiler.stage(stage_name, 'export', table_name)
+
+    # 엑셀 파일과 테이블 스키마가 직/간접적으로 참조하는 모든 스키마 파일의 해시
+    # 매니페스트 기록과 수정 시각, 크기가 같은 파일은 다시 해시하지 않는다.
+    # @return { 파일명 : 해시 }, { 파일명 : [수정 시각 ns, 크기] }
+    def hash_table_inputs(self, table_name, schema_file_name):
+        entry = self.manifest.find_entry(table_name)
+        digests = entry['inputs'] if entry is not None else {}
+        stats = entry['input_stats'] if entry is not None else {}
 
-        self.validate_table_data(data, schema)
+        table_file_name = table_name + '.xlsx'
+        input_file_paths = { table_file_name: os.path.join(self.config.table_dir_path, table_file_name) }
+        for dependency_file_name in self.schema_graph.find_dependencies(schema_file_name):
+            input_file_paths[dependency_file_name] = os.path.join(self.config.schema_dir_path, dependency_file_name)
+
+        input_hashes = {}
+        input_stats = {}
+        for file_name, file_path in input_file_paths.items():
+            input_hashes[file_name], input_stats[file_name] = ExportManifest.hash_file_if_changed(file_path, file_name, digests, stats)
+
+        return input_hashes, input_stats
+
+    # 모든 테이블의 타입 정보를 만들어 스키마 참조 관계를 기록한다. 엑셀은 읽지 않음
+    # resolve_schema_ref() 에서 따라간 참조만 기록되므로 테이블 데이터에 쓰이는 참조만 포함됨
+    def build_schema_graph(self):
+        for table_name in self.find_table_names():
+            schema_file_name = table_name + '.table.json'
+            schema = self.load_schema(schema_file_name, True)
+            self.create_type_info(schema, schema_file_name)
+
+        return self.schema_graph
+
+    # 바뀐 스키마 파일에 직/간접적으로 의존하는 테이블명 목록
+    def find_dependent_tables(self, schema_file_names):
+        table_names = []
+
+        for file_name in self.schema_graph.find_dependents(schema_file_names):
+            if file_name.endswith('.table.json'):
+                table_names.append(file_name.split('.', 1)[0])
+
+        return table_names
+
+    # 모든 검사기가 공유하는 참조 해석기
+    # 읽어둔 스키마를 저장소에 넣어 $ref 마다 파일을 다시 읽지 않게 한다.
+    def create_schema_resolver(self):
+        schema_dir_abs_path = os.path.abspath(self.config.schema_dir_path)
+        resolver = RefResolver('file:{}/'.format(schema_dir_abs_path), None)
 
-        self.write_asset(data, table_name)
+        for schema_file_name, schema in self.cached_schemas.items():
+            resolver.store[resolver.base_uri + schema_file_name] = schema
+
+        return resolver
+
+    # 스키마 파일이 바뀌었을 때 캐시에서 제거
+    # 해석기는 참조한 문서를 따로 캐시하므로 검사기와 함께 새로 만든다.
+    def invalidate_schema(self, schema_file_name):
+        self.cached_schemas.pop(schema_file_name, None)
+        self.cached_schema_stats.pop(schema_file_name, None)
+        self.schema_graph.remove_refs(schema_file_name)
+        self.cached_validators = {}
+        self.schema_resolver = self.create_schema_resolver()
+
+    # 캐시에 넣은 뒤 파일이 바뀌거나 지워진 스키마를 캐시에서 제거한다.
+    def refresh_schema_cache(self):
+        for schema_file_name, schema_file_stat in list(self.cached_schema_stats.items()):
+            if DataExporter.get_file_stat(os.path.join(self.config.schema_dir_path, schema_file_name)) != schema_file_stat:
+                self.invalidate_schema(schema_file_name)
+
+    # @return (수정 시각, 크기). 파일이 없으면 None
+    @staticmethod
+    def get_file_stat(file_path):
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+
+        return (file_stat.st_mtime_ns, file_stat.st_size)
 
     def load_schema(self, schema_file_name, save_to_cache):
         if schema_file_name in self.cached_schemas:
             return self.cached_schemas[schema_file_name]
 
         schema_file_path = os.path.join(self.config.schema_dir_path, schema_file_name)
+        # 읽는 도중 바뀌어도 다음 확인 때 알 수 있도록 읽기 전 상태를 기록
+        schema_file_stat = DataExporter.get_file_stat(schema_file_path)
 
         schema = None
         with open(schema_file_path, 'r', encoding='UTF8') as fp:
@@ -53,6 +349,8 @@ class DataExporter:
 
         if save_to_cache:
             self.cached_schemas[schema_file_name] = schema
+            self.cached_schema_stats[schema_file_name] = schema_file_stat
+            self.schema_resolver.store[self.schema_resolver.base_uri + schema_file_name] = schema
 
         return schema
 
@@ -81,17 +379,23 @@ class DataExporter:
             if item_type == 'array':
                 raise Exception('Nested array schema is not supported!')
             elif item_type == 'object':
+                node.required = item_schema.get('required', [])
+                node.index_keys = item_schema.get('x-index', [])
+                node.sort_key = item_schema.get('x-sort-key')
                 for item_property_name, item_property_schema in item_schema['properties'].items():
                     node.add_member(self.create_type_node(item_property_name, item_property_schema, item_schema_file_name))
             else:
                 node.parse_type = self.determine_leaf_node_parse_type(item_type)
+                node.constraint = ValueConstraint.from_schema(item_schema)
         
         elif node_type == 'object':
+            node.required = node_schema.get('required', [])
             for node_property_name, node_property_schema in node_schema['properties'].items():
                     node.add_member(self.create_type_node(node_property_name, node_property_schema, node_schema_file_name))
         
         else:
             node.parse_type = self.determine_leaf_node_parse_type(node_type)
+            node.constraint = ValueConstraint.from_schema(node_schema)
 
         return node
 
@@ -116,6 +420,8 @@ class DataExporter:
             if len(ref_schema_file_name) == 0:
                 ref_schema_file_name = current_schema_file_name
             
+            self.schema_graph.add_ref(current_schema_file_name, ref_schema_file_name)
+
             ref_schema = self.load_schema(ref_schema_file_name, True)
             
             paths = ref_schema_path.split('/') # ['', 'definitions', 'dayOfWeek']
@@ -132,35 +438,82 @@ class DataExporter:
     # 엑셀 테이블을 데이터로 변환
     ##################################################
 
+    @staticmethod
+    def create_sheet_cache(config):
+        if config.sheet_cache_dir_path is None:
+            return None
+
+        return SheetCache(config.sheet_cache_dir_path, config.sheet_cache_max_bytes)
+
+    # 내용이 같은 엑셀을 이미 읽은 적이 있으면 시트 캐시에서 복원한다.
+    def load_data_sheet(self, table_file_path):
+        if self.sheet_cache is None:
+            return DataExporter.read_data_sheet(table_file_path, self.config.fast_sheet_reader, self.get_sheet_read_jobs())
+
+        sheet, content_hash = self.sheet_cache.find(table_file_path)
+        if sheet is None:
+            sheet = DataExporter.read_data_sheet(table_file_path, self.config.fast_sheet_reader, self.get_sheet_read_jobs())
+            self.sheet_cache.save(content_hash, sheet)
+
+        return sheet
+
+    # 테이블을 여러 프로세스에서 내보내는 중에는 시트 파싱 프로세스를 따로 만들지 않는다.
+    def get_sheet_read_jobs(self):
+        return self.config.sheet_read_jobs if self.config.jobs <= 1 else 1
+
+    # read_only 모드로 Data 시트만 행 단위로 읽어 버퍼에 담는다.
+    # 전체 모드는 모든 시트의 셀 객체를 만들어 큰 테이블에서 느리고 메모리를 많이 쓴다.
+    # 셀 값은 XlsxSheetReader 로 워크시트 XML 에서 바로 읽고, 처리할 수 없는 형식이면 openpyxl 로 읽는다.
+    @staticmethod
+    def read_data_sheet(table_file_path, uses_fast_reader=True, sheet_read_jobs=1):
+        if uses_fast_reader:
+            reader = XlsxSheetReader.open(table_file_path, 'Data', sheet_read_jobs)
+            if reader is not None:
+                try:
+                    sheet = reader.read()
+                finally:
+                    reader.close()
+
+                if sheet is not None:
+                    return sheet
+
+        # 빠른 리더로 읽을 수 없는 시트. 시트가 없을 때의 오류도 openpyxl 에 맡긴다.
+        wb = load_workbook(table_file_path, read_only=True, data_only=True)
+        try:
+            return DataSheet.from_worksheet(wb['Data'])
+        finally:
+            wb.close()
+
     def read_table(self, type_info_root, table_name):
         table_file_name = table_name + '.xlsx'
         table_file_path = os.path.join(self.config.table_dir_path, table_file_name)
 
-        wb = load_workbook(table_file_path, data_only=True)
-        ws_data = wb['Data']
-        type_max_depth = DataExporter.calc_max_depth(type_info_root, 0)
-        header_info_root = DataExporter.create_data_header_info(ws_data, type_max_depth)
-        #print(str(header_info_root))
+        with self.profile_stage('load_workbook', table_name) as stage:
+            sheet = self.load_data_sheet(table_file_path)
+            if self.profiler is not None:
+                stage.counts.update({ 'rows': sheet.max_row, 'columns': sheet.max_column, 'cells': sheet.count_values() })
 
-        DataExporter.validate_header_info(type_info_root, header_info_root)
+        with self.profile_stage('parse_header', table_name):
+            type_max_depth = DataExporter.calc_max_depth(type_info_root, 0)
+            header_info_root = DataExporter.create_data_header_info(sheet, type_max_depth)
+            #print(str(header_info_root))
 
-        data = DataExporter.load_datas(ws_data, type_info_root, header_info_root)
-        #print(data)
+            DataExporter.validate_header_info(type_info_root, header_info_root)
 
-        return data
+        # 레코드는 꺼내 쓰는 시점에 하나씩 읽는다.
+        # 읽기와 쓰기가 번갈아 실행되므로 load_datas 단계는 레코드를 읽는 데 쓴 시간의 합계
+        datas = DataExporter.iter_datas(sheet, type_info_root, header_info_root)
+        if self.profiler is not None:
+            datas = self.profiler.iter_stage('load_datas', 'export', table_name, datas, 'records')
 
-    # 특정 노드 하위에서 지정한 이름 경로의 타입 정보 노드를 찾는다.
+        return datas
+
+    # 특정 헤더 노드 하위에서 지정한 이름 경로의 노드를 찾는다.
+    # 경로별 결과는 노드에 기억되므로 헤더 검사 중 같은 앞부분 경로를 다시 찾을 때 멤버를 훑지 않는다.
     # @param names 예) ['rewards', 'condition', 'firstClear']
     @staticmethod
     def find_node_py_path(node, node_path):
-        if len(node_path) == 0:
-            return node
-            
-        member = node.find_member(node_path[0])
-        if member is not None:
-            return DataExporter.find_node_py_path(member, node_path[1:])
-
-        return None
+        return node.find_path(node_path)
 
     # 타입 정보 트리에서 가장 깊은 depth 값을 구한다.
     @staticmethod
@@ -178,82 +531,100 @@ class DataExporter:
         return max_depth
 
     @staticmethod
-    def calc_node_col_end(ws, row_idx, col_idx_start, col_idx_max):
+    def calc_node_col_end(sheet, row_idx, col_idx_start, col_idx_max):
         # 시작 컬럼은 항상 유효하다고 가정
         # start + 1 ~ max 순회
         # 값이 있는 다음 셀 찾아 그 전까지를 노드 마지막 col 로 구함
-        for col_idx in range(col_idx_start + 1, col_idx_max + 1):
-            if ws.cell(row=row_idx, column=col_idx).value is not None:
-                return col_idx - 1
+        next_col_idx = sheet.find_next_column(row_idx, col_idx_start + 1)
+        if next_col_idx <= col_idx_max:
+            return next_col_idx - 1
         
         return col_idx_max
     
     @staticmethod
-    def calc_node_row_end(ws, col_idx, row_idx_start, row_idx_max):
+    def calc_node_row_end(sheet, col_idx, row_idx_start, row_idx_max):
         # 시작 행은 항상 유효하다고 가정
         # start + 1 ~ max 순회
         # 값이 있는 다음 셀 찾아 그 전까지를 노드 마지막 row 로 구함
-        for row_idx in range(row_idx_start + 1, row_idx_max + 1):
-            if ws.cell(row=row_idx, column=col_idx).value is not None:
-                return row_idx - 1
+        next_row_idx = sheet.find_next_row(col_idx, row_idx_start + 1)
+        if next_row_idx <= row_idx_max:
+            return next_row_idx - 1
         
         return row_idx_max
     
     @staticmethod
-    def is_empty_row(ws, row_idx, col_idx_start, col_idx_max):
-        for row in ws.iter_rows(min_row=row_idx, max_row=row_idx, min_col=col_idx_start, max_col=col_idx_max):
-            for cell in row:
-                if cell.value is not None:
-                    return False
-        
-        return True
+    def is_empty_row(sheet, row_idx, col_idx_start, col_idx_max):
+        return sheet.is_empty_row(row_idx, col_idx_start, col_idx_max)
+
+    # 헤더 행에서 값이 있는 셀을 컬럼 순서로 모은다. 같은 컬럼에서는 위 행부터
+    # 헤더 행 모두 값이 없는 컬럼은 다음 값 있는 컬럼 색인으로 건너뛴다.
+    # @return [(행 인덱스, 컬럼 인덱스, 값)]
+    @staticmethod
+    def collect_header_cells(sheet, max_depth):
+        header_cells = []
+
+        col_idx = DataExporter.find_next_header_column(sheet, max_depth, 1)
+        while col_idx <= sheet.max_column:
+            for row_idx in range(1, max_depth + 1):
+                cell_value = sheet.value(row_idx, col_idx)
+                if cell_value is not None:
+                    header_cells.append((row_idx, col_idx, cell_value))
+
+            col_idx = DataExporter.find_next_header_column(sheet, max_depth, col_idx + 1)
+
+        return header_cells
+
+    # 헤더 행 중 하나라도 값이 있는 지정 컬럼 이후(포함) 첫 컬럼. 없으면 max_column + 1
+    @staticmethod
+    def find_next_header_column(sheet, max_depth, col_idx):
+        return min((sheet.find_next_column(row_idx, col_idx) for row_idx in range(1, max_depth + 1)), default=sheet.max_column + 1)
 
     @staticmethod
-    def create_data_header_info(ws, max_depth):
-        root = HeaderNode('_root', 1, ws.max_column)
+    def create_data_header_info(sheet, max_depth):
+        header_cells = DataExporter.collect_header_cells(sheet, max_depth)
+
+        root = HeaderNode('_root', 1, sheet.max_column)
         ancestors = [root]
 
-        for col in ws.iter_cols(max_row=max_depth):
-            for cell in col:
-                if cell.value is not None:
-                    parent = ancestors[-1]
-                    parent_depth = len(ancestors) - 1
-                    cell_depth = cell.row
-
-                    node_name = cell.value
-                    node_col_start = cell.col_idx
-
-                    if cell_depth == max_depth:
-                        # 자식 leaf 노드
-                        node_col_end = DataExporter.calc_node_col_end(ws, cell.row, node_col_start, parent.col_end)
-                        newNode = HeaderNode(node_name, node_col_start, node_col_end)
-                        parent.add_member(newNode)
-                    
-                    elif cell_depth == parent_depth + 1:
-                        # 자식 중간 노드
-                        node_col_end = DataExporter.calc_node_col_end(ws, cell.row, node_col_start, parent.col_end)
-                        newNode = HeaderNode(node_name, node_col_start, node_col_end)
-                        parent.add_member(newNode)
-                        ancestors.append(newNode)
-                    
-                    elif cell_depth == parent_depth:
-                        # 부모와 같은 depth 의 중간 노드
-                        del ancestors[-1]
-                        newParent = ancestors[-1]
-                        node_col_end = DataExporter.calc_node_col_end(ws, cell.row, node_col_start, newParent.col_end)
-                        newNode = HeaderNode(node_name, node_col_start, node_col_end)
-                        newParent.add_member(newNode)
-                        ancestors.append(newNode)
-                    
-                    elif cell_depth < parent_depth:
-                        # 부모를 거슬러 올라가는 depth 의 중간노드
-                        up_depth = cell_depth - parent_depth - 1
-                        del ancestors[up_depth:]
-                        newParent = ancestors[-1]
-                        node_col_end = DataExporter.calc_node_col_end(ws, cell.row, node_col_start, newParent.col_end)
-                        newNode = HeaderNode(node_name, node_col_start, node_col_end)
-                        newParent.add_member(newNode)
-                        ancestors.append(newNode)
+        for row_idx, col_idx, cell_value in header_cells:
+            parent = ancestors[-1]
+            parent_depth = len(ancestors) - 1
+            cell_depth = row_idx
+
+            node_name = cell_value
+            node_col_start = col_idx
+
+            if cell_depth == max_depth:
+                # 자식 leaf 노드
+                node_col_end = DataExporter.calc_node_col_end(sheet, row_idx, node_col_start, parent.col_end)
+                newNode = HeaderNode(node_name, node_col_start, node_col_end)
+                parent.add_member(newNode)
+            
+            elif cell_depth == parent_depth + 1:
+                # 자식 중간 노드
+                node_col_end = DataExporter.calc_node_col_end(sheet, row_idx, node_col_start, parent.col_end)
+                newNode = HeaderNode(node_name, node_col_start, node_col_end)
+                parent.add_member(newNode)
+                ancestors.append(newNode)
+            
+            elif cell_depth == parent_depth:
+                # 부모와 같은 depth 의 중간 노드
+                del ancestors[-1]
+                newParent = ancestors[-1]
+                node_col_end = DataExporter.calc_node_col_end(sheet, row_idx, node_col_start, newParent.col_end)
+                newNode = HeaderNode(node_name, node_col_start, node_col_end)
+                newParent.add_member(newNode)
+                ancestors.append(newNode)
+            
+            elif cell_depth < parent_depth:
+                # 부모를 거슬러 올라가는 depth 의 중간노드
+                up_depth = cell_depth - parent_depth - 1
+                del ancestors[up_depth:]
+                newParent = ancestors[-1]
+                node_col_end = DataExporter.calc_node_col_end(sheet, row_idx, node_col_start, newParent.col_end)
+                newNode = HeaderNode(node_name, node_col_start, node_col_end)
+                newParent.add_member(newNode)
+                ancestors.append(newNode)
 
         return root
     
@@ -274,126 +645,311 @@ class DataExporter:
             DataExporter.validate_type_node_exist_in_header(member, header_root, node_path)
 
     @staticmethod
-    def parse_cell(parse_type, cell):
+    def parse_cell(parser, value, row_idx, col_idx):
         try:
-            # 타입 무관하게 셀이 비어있으면 None 취급
-            if cell.value is None:
-                return None
-
-            if parse_type == TypeNodeParseType.INT:
-                return int(cell.value)
-            elif parse_type == TypeNodeParseType.FLOAT:
-                return float(cell.value)
-            elif parse_type == TypeNodeParseType.BOOL:
-                return bool(cell.value)
-            elif parse_type == TypeNodeParseType.STRING:
-                return str(cell.value) if cell.value is not None else ''
-            else:
-                raise Exception('Invalid type name to parse. parse_type:{}, coordinate:{}'.format(parse_type, cell.coordinate))
+            return parser(value)
         except Exception as e:
-            print('Exception on parse_cell(). coordinate:{}'.format(cell.coordinate))
+            print('Exception on parse_cell(). coordinate:{}'.format(DataSheet.coordinate(row_idx, col_idx)))
             raise e
 
+    # 셀 값 파싱 함수
+    # 셀이 비어있는 경우는 호출하는 쪽에서 None 으로 처리
     @staticmethod
-    def load_datas(ws, type_info_root, header_info_root):
-        header_row_count = DataExporter.calc_max_depth(type_info_root, 0)
-        data_row_start = header_row_count + 1
-        data_row_max = max(ws.max_row, data_row_start)
-
-        return DataExporter.load_node_array(ws, type_info_root, header_info_root, data_row_start, data_row_max)
+    def determine_cell_parser(parse_type):
+        if parse_type == TypeNodeParseType.INT:
+            return int
+        elif parse_type == TypeNodeParseType.FLOAT:
+            return float
+        elif parse_type == TypeNodeParseType.BOOL:
+            return bool
+        elif parse_type == TypeNodeParseType.STRING:
+            return str
+        else:
+            def parse_invalid_type(value):
+                raise Exception('Invalid type name to parse. parse_type:{}'.format(parse_type))
+            return parse_invalid_type
 
+    # 타입 정보와 헤더 정보로 오브젝트 노드의 디코딩 계획을 만든다.
+    # 멤버 검색과 노드 유형 분기는 여기서 한 번만 수행한다.
     @staticmethod
-    def load_node_object(ws, type_node, header_node, row_start, row_max):
-        data = {}
-        row_end = row_max
-        
+    def compile_decode_plan(type_node, header_node):
+        plan = DecodePlan(header_node.col_start, header_node.col_end)
+
         for member_header_node in header_node.members:
-            member_name = member_header_node.name
             member_type_node = type_node.find_member(member_header_node.name)
 
             # 주석 컬럼은 타입 정보에 없음. 오류 아님
             if member_type_node is None:
                 continue
-            
-            # 배열은 여러 행에 걸쳐 있을 수 있으므로
-            # 배열이 아닌 타입을 기준으로 노드 마지막 행을 갱신한다.
-            if not member_type_node.is_array:
-                row_end = DataExporter.calc_node_row_end(ws, member_header_node.col_start, row_start, row_end)
+
+            step = DecodeStep()
+            step.key = member_header_node.name
+            step.col_idx = member_header_node.col_start
+            step.is_array = member_type_node.is_array
 
             if member_type_node.is_leaf():
+                step.parser = DataExporter.determine_cell_parser(member_type_node.parse_type)
+                step.constraint = member_type_node.constraint
                 if not member_type_node.is_array:
                     # 단일값
-                    data_value = DataExporter.load_leaf_value(ws, member_type_node, member_header_node, row_start)
-                    if not data_value is None:
-                        data[member_name] = data_value
+                    step.load = DataExporter.load_leaf_value
                 else:
                     # 단일값 배열
-                    data_values = DataExporter.load_leaf_array(ws, member_type_node, member_header_node, row_start, row_end)
-                    if not data_values is None:
-                        if not member_name in data:
-                            data[member_name] = []
-                        data[member_name].extend(data_values)
+                    step.load = DataExporter.load_leaf_array
             else:
+                step.sub_plan = DataExporter.compile_decode_plan(member_type_node, member_header_node)
                 if not member_type_node.is_array:
                     # 구조체
-                    data_value = DataExporter.load_node_object(ws, member_type_node, member_header_node, row_start, row_end).data
-                    if not data_value is None:
-                        data[member_name] = data_value
+                    step.load = DataExporter.load_struct_value
                 else:
                     # 구조체 배열
-                    data_values = DataExporter.load_node_array(ws, member_type_node, member_header_node, row_start, row_end)
-                    if not data_values is None:
-                        if not member_name in data:
-                            data[member_name] = []
-                        data[member_name].extend(data_values)
+                    step.load = DataExporter.load_struct_array
+
+            plan.add_step(step)
+
+        # 필수 멤버가 빠졌을 때는 그 멤버의 첫 컬럼을 오류 위치로 알린다.
+        for required_name in type_node.required:
+            required_header_node = header_node.find_member(required_name)
+            required_col_idx = required_header_node.col_start if required_header_node is not None else header_node.col_start
+            plan.required_members.append((required_name, required_col_idx))
+
+        return plan
+
+    # 최상위 배열 항목의 id 와 'x-index' 의 첫 키(기본 키)는 겹치면 안 됨
+    # 생성 코드의 조회 컨테이너가 기본 키 값이 겹치지 않는다고 가정함. 나머지 'x-index' 키는 겹쳐도 되는 보조 키
+    @staticmethod
+    def compile_root_decode_plan(type_info_root, header_info_root):
+        plan = DataExporter.compile_decode_plan(type_info_root, header_info_root)
+
+        for index_key_name in type_info_root.index_keys:
+            index_key_type_node = type_info_root.find_member(index_key_name)
+            if index_key_type_node is None or not index_key_type_node.is_leaf() or index_key_type_node.is_array:
+                raise Exception('Invalid x-index key: {}'.format(index_key_name))
+
+        key_names = ['id']
+        if len(type_info_root.index_keys) > 0 and type_info_root.index_keys[0] != 'id':
+            key_names.append(type_info_root.index_keys[0])
+
+        for key_name in key_names:
+            key_type_node = type_info_root.find_member(key_name)
+            key_header_node = header_info_root.find_member(key_name)
+            if key_type_node is not None and key_type_node.is_leaf() and not key_type_node.is_array and key_header_node is not None:
+                plan.unique_keys.append((key_name, key_header_node.col_start))
+
+        return plan
+
+    @staticmethod
+    def load_datas(sheet, type_info_root, header_info_root):
+        datas = list(DataExporter.iter_datas(sheet, type_info_root, header_info_root))
+        return datas if len(datas) > 0 else None
+
+    # 최상위 배열 항목을 하나씩 읽어 돌려주는 제너레이터
+    @staticmethod
+    def iter_datas(sheet, type_info_root, header_info_root):
+        header_row_count = DataExporter.calc_max_depth(type_info_root, 0)
+        data_row_start = header_row_count + 1
+        data_row_max = max(sheet.max_row, data_row_start)
+
+        plan = DataExporter.compile_root_decode_plan(type_info_root, header_info_root)
+        if DataExporter.is_flat_plan(plan):
+            return DataExporter.iter_flat_node_array(sheet, plan, data_row_start, data_row_max)
+        return DataExporter.iter_node_array(sheet, plan, data_row_start, data_row_max)
+
+    # 모든 멤버가 배열이 아닌 리프인 평평한 테이블이면 True
+    @staticmethod
+    def is_flat_plan(plan):
+        return len(plan.steps) > 0 and all(step.sub_plan is None and not step.is_array for step in plan.steps)
+
+    # 평평한 테이블의 최상위 배열 항목을 컬럼 단위로 변환해 하나씩 돌려주는 제너레이터
+    # 리프 컬럼마다 값이 있는 셀을 변환 함수 한 번의 map 으로 변환하고 제약 조건도 컬럼 단위로 검사한 뒤, 행마다 dict 만 조립한다.
+    # 평평한 테이블은 멤버 컬럼에 값이 있는 행이 곧 항목이므로 결과는 iter_node_array() 와 같다.
+    # 변환할 수 없거나 제약 조건을 어기는 셀이 있으면 그 행부터 iter_node_array() 로 읽어 행 순서대로 같은 오류를 낸다.
+    @staticmethod
+    def iter_flat_node_array(sheet, plan, row_start, row_max):
+        row_end = min(row_max, sheet.max_row)
+        keys = [step.key for step in plan.steps]
+
+        columns = []
+        for step in plan.steps:
+            if step.col_idx <= sheet.max_column:
+                cell_values = sheet.columns[step.col_idx - 1][row_start - 1:row_end]
+            else:
+                cell_values = [None] * (row_end - row_start + 1)
+            column = DataExporter.parse_column(step.parser, cell_values)
+
+            if step.constraint is not None:
+                violation_idx = step.constraint.find_violation_index(column)
+                if violation_idx is not None:
+                    del column[violation_idx:]
+
+            columns.append(column)
+
+        # 가장 먼저 실패한 행 앞까지만 조립
+        error_row_idx = row_start + min(len(column) for column in columns)
+        unique_values = {}
+
+        for row_idx, values in zip(range(row_start, error_row_idx), zip(*columns)):
+            data = { key: value for key, value in zip(keys, values) if value is not None }
+            if len(data) == 0:
+                continue
+
+            DataExporter.check_required_members(plan, data, row_idx)
+            DataExporter.check_unique_keys(plan, data, unique_values, row_idx)
+            yield data
+
+        if error_row_idx <= row_end:
+            yield from DataExporter.iter_node_array(sheet, plan, error_row_idx, row_max, unique_values)
+
+    # 컬럼의 값이 있는 셀들을 변환 함수 하나로 한 번에 변환한다. 빈 셀은 None 으로 둔다.
+    # @return 변환한 값 목록. 변환할 수 없는 셀이 있으면 그 셀 앞까지
+    @staticmethod
+    def parse_column(parser, cell_values):
+        present_values = [value for value in cell_values if value is not None]
+        try:
+            parsed_values = list(map(parser, present_values))
+        except Exception:
+            parsed_values = []
+            for value in present_values:
+                try:
+                    parsed_values.append(parser(value))
+                except Exception:
+                    break
+
+        if len(present_values) == len(cell_values):
+            return parsed_values
+
+        parsed_value_iter = iter(parsed_values)
+        column = [None if value is None else next(parsed_value_iter, PARSE_FAILED) for value in cell_values]
+        if len(parsed_values) < len(present_values):
+            del column[column.index(PARSE_FAILED):]
+        return column
+
+    @staticmethod
+    def load_node_object(sheet, plan, row_start, row_max):
+        data = {}
+        row_end = row_max
+        next_rows = sheet.next_rows
+        
+        for step in plan.steps:
+            if not step.is_array:
+                # 배열은 여러 행에 걸쳐 있을 수 있으므로
+                # 배열이 아닌 타입을 기준으로 노드 마지막 행을 갱신한다.
+                # calc_node_row_end() 와 같음. 행마다 여러 번 불리므로 색인을 직접 조회
+                next_row_idx = next_rows[step.col_idx - 1][row_start + 1]
+                if next_row_idx <= row_end:
+                    row_end = next_row_idx - 1
+
+                data_value = step.load(sheet, step, row_start, row_end)
+                if not data_value is None:
+                    data[step.key] = data_value
+            else:
+                data_values = step.load(sheet, step, row_start, row_end)
+                if not data_values is None:
+                    if not step.key in data:
+                        data[step.key] = []
+                    data[step.key].extend(data_values)
 
         if len(data) == 0:
             data = None
+        else:
+            DataExporter.check_required_members(plan, data, row_start)
         return LoadedNodeObjectInfo(data, row_end)
 
     @staticmethod
-    def load_node_array(ws, type_node, header_node, row_start, row_max):
-        datas = []
+    def load_node_array(sheet, plan, row_start, row_max):
+        datas = list(DataExporter.iter_node_array(sheet, plan, row_start, row_max))
+        return datas if len(datas) > 0 else None
+
+    # @param unique_values { 필드명 : 값 집합 } 앞에서 읽은 항목의 겹치면 안 되는 필드 값. 이어서 읽을 때 넘긴다.
+    @staticmethod
+    def iter_node_array(sheet, plan, row_start, row_max, unique_values=None):
         row_idx = row_start
+        if unique_values is None:
+            unique_values = {}
 
         while row_idx <= row_max:
             # 빈 줄을 만나면 다음 줄로 넘어감
             # 데이터 구분 위해 의도적으로 빈 줄 남기는 경우 위함
-            if DataExporter.is_empty_row(ws, row_idx, header_node.col_start, header_node.col_end):
+            if DataExporter.is_empty_row(sheet, row_idx, plan.col_start, plan.col_end):
                 row_idx += 1
                 continue
             
-            loaded_info = DataExporter.load_node_object(ws, type_node, header_node, row_idx, row_max)
+            loaded_info = DataExporter.load_node_object(sheet, plan, row_idx, row_max)
             if not loaded_info.data is None:
-                datas.append(loaded_info.data)
+                DataExporter.check_unique_keys(plan, loaded_info.data, unique_values, row_idx)
+                yield loaded_info.data
             row_idx = loaded_info.row_end + 1
 
-        if len(datas) > 0:
-            return datas
-        else:
-            return None
+    @staticmethod
+    def check_required_members(plan, data, row_idx):
+        for required_name, required_col_idx in plan.required_members:
+            if not required_name in data:
+                raise Exception('Required member {} is missing. coordinate:{}'.format(required_name, DataSheet.coordinate(row_idx, required_col_idx)))
+
+    @staticmethod
+    def check_unique_keys(plan, data, unique_values, row_idx):
+        for key_name, key_col_idx in plan.unique_keys:
+            if not key_name in data:
+                continue
+
+            key_value = data[key_name]
+            key_values = unique_values.setdefault(key_name, set())
+            if key_value in key_values:
+                raise Exception('Duplicated {}: {!r}. coordinate:{}'.format(key_name, key_value, DataSheet.coordinate(row_idx, key_col_idx)))
+            key_values.add(key_value)
+
+    @staticmethod
+    def check_constraint(constraint, value, row_idx, col_idx):
+        violation = constraint.find_violation(value)
+        if violation is not None:
+            raise Exception('Invalid value. {}. coordinate:{}'.format(violation, DataSheet.coordinate(row_idx, col_idx)))
+
+    # 구조체 단일값 구하기
+    @staticmethod
+    def load_struct_value(sheet, step, row_start, row_end):
+        return DataExporter.load_node_object(sheet, step.sub_plan, row_start, row_end).data
+
+    # 구조체 배열 구하기
+    @staticmethod
+    def load_struct_array(sheet, step, row_start, row_end):
+        return DataExporter.load_node_array(sheet, step.sub_plan, row_start, row_end)
 
     # 리프노드 단일값 구하기
     @staticmethod
-    def load_leaf_value(ws, type_node, header_node, row_start):
-        cell = ws.cell(column=header_node.col_start, row=row_start)
-        return DataExporter.parse_cell(type_node.parse_type, cell)
+    def load_leaf_value(sheet, step, row_start, row_end):
+        # 타입 무관하게 셀이 비어있으면 None 취급
+        # 헤더가 있는 컬럼과 데이터가 있는 행이므로 범위 검사 생략
+        cell_value = sheet.columns[step.col_idx - 1][row_start - 1]
+        if cell_value is None:
+            return None
+
+        data_value = DataExporter.parse_cell(step.parser, cell_value, row_start, step.col_idx)
+        if step.constraint is not None:
+            DataExporter.check_constraint(step.constraint, data_value, row_start, step.col_idx)
+        return data_value
 
     # 리프노드 배열 구하기
     @staticmethod
-    def load_leaf_array(ws, type_node, header_node, row_start, row_max):
+    def load_leaf_array(sheet, step, row_start, row_end):
         datas = []
-        
-        for col in ws.iter_cols(min_col=header_node.col_start, max_col=header_node.col_start, min_row=row_start, max_row=row_max):
-            for cell in col:
-                # 빈 줄을 만나면 다음 줄로 넘어감
-                # load_node_array() 와 동작 맞추기 위함
-                if cell.value is None:
-                    continue
-                
-                data_value = DataExporter.parse_cell(type_node.parse_type, cell)
-                if not data_value is None:
-                    datas.append(data_value)
+        col_idx = step.col_idx
+        if col_idx > sheet.max_column:
+            return None
+
+        column = sheet.columns[col_idx - 1]
+        for row_idx in range(row_start, min(row_end, sheet.max_row) + 1):
+            cell_value = column[row_idx - 1]
+
+            # 빈 줄을 만나면 다음 줄로 넘어감
+            # load_node_array() 와 동작 맞추기 위함
+            if cell_value is None:
+                continue
+            
+            data_value = DataExporter.parse_cell(step.parser, cell_value, row_idx, col_idx)
+            if step.constraint is not None:
+                DataExporter.check_constraint(step.constraint, data_value, row_idx, col_idx)
+            if not data_value is None:
+                datas.append(data_value)
         
         if len(datas) > 0:
             return datas
@@ -405,39 +961,132 @@ class DataExporter:
     # 테이블 데이터 유효성 검사
     ##################################################
 
-    def validate_table_data(self, data, schema):
-        schema_dir_abs_path = os.path.abspath(self.config.schema_dir_path)
-        resolver = RefResolver('file:{}/'.format(schema_dir_abs_path), None)
-
-        validator = Draft7Validator(schema, resolver=resolver)
+    def validate_table_data(self, data, schema_file_name):
+        validator = self.get_validator(schema_file_name)
         validator.validate(data)
 
+    def get_validator(self, schema_file_name):
+        if schema_file_name in self.cached_validators:
+            return self.cached_validators[schema_file_name]
+
+        schema = self.load_schema(schema_file_name, True)
+        validator = Draft7Validator(schema, resolver=self.schema_resolver)
+
+        self.cached_validators[schema_file_name] = validator
+        return validator
+
 
     ##################################################
     # 데이터 어셋 파일 쓰기
     ##################################################
 
-    def write_asset(self, data, table_name):
-        asset_file_name = table_name + '.json'
-        asset_file_path = os.path.join(self.config.asset_dir_path, asset_file_name)
+    # 'x-sort-key' 값 순서로 정렬. 키 값이 같으면 엑셀 행 순서를 유지해 어셋 변경 내용을 줄인다.
+    # 키가 없는 레코드는 맨 뒤
+    @staticmethod
+    def sort_datas(datas, type_info_root):
+        key_name = type_info_root.sort_key
+        key_type_node = type_info_root.find_member(key_name)
+        if key_type_node is None or not key_type_node.is_leaf() or key_type_node.is_array:
+            raise Exception('Invalid x-sort-key: {}'.format(key_name))
 
-        old_dump = None
+        if datas is None:
+            return None
+
+        sorted_datas = sorted(datas, key=lambda data: (not key_name in data, data.get(key_name, 0)))
+        return sorted_datas if len(sorted_datas) > 0 else None
+
+    def get_asset_file_path(self, table_name):
+        asset_file_name = table_name + '.json'
+        return os.path.join(self.config.asset_dir_path, asset_file_name)
+
+    def get_binary_asset_file_path(self, table_name):
+        asset_file_name = table_name + '.bytes'
+        return os.path.join(self.config.asset_dir_path, asset_file_name)
+
+    def get_columnar_asset_file_path(self, table_name):
+        asset_file_name = table_name + '.columns'
+        return os.path.join(self.config.asset_dir_path, asset_file_name)
+
+    def get_sort_index_file_path(self, table_name):
+        asset_file_name = table_name + '.index.json'
+        return os.path.join(self.config.asset_dir_path, asset_file_name)
+
+    # 설정에 따라 내보낼 모든 어셋 파일 경로
+    def get_asset_file_paths(self, type_info_root, table_name):
+        asset_file_paths = []
+
+        if self.config.writes_json_asset():
+            asset_file_paths.append(self.get_asset_file_path(table_name))
+        if self.config.writes_binary_asset():
+            asset_file_paths.append(self.get_binary_asset_file_path(table_name))
+        if self.config.columnar_asset:
+            asset_file_paths.append(self.get_columnar_asset_file_path(table_name))
+        if type_info_root.sort_key is not None:
+            asset_file_paths.append(self.get_sort_index_file_path(table_name))
+
+        return asset_file_paths
+
+    def create_asset_writers(self, type_info_root, table_name):
+        writers = []
+
+        if self.config.writes_json_asset():
+            writers.append(JsonAssetWriter(self.get_asset_file_path(table_name)))
+        if self.config.writes_binary_asset():
+            writers.append(BinaryAssetWriter(self.get_binary_asset_file_path(table_name), type_info_root))
+        if self.config.columnar_asset:
+            writers.append(ColumnarAssetWriter(self.get_columnar_asset_file_path(table_name), type_info_root))
+
+        # 다른 기록기가 닫힌 뒤 레코드 위치를 모으므로 마지막에 둔다.
+        if type_info_root.sort_key is not None:
+            writers.append(SortIndexWriter(self.get_sort_index_file_path(table_name), type_info_root.sort_key, list(writers)))
+
+        return writers
+
+    # 레코드를 하나씩 임시 파일에 쓰면서 해시를 구하고, 기존 어셋 해시와 다를 때만 교체한다.
+    # 기존 어셋과 새 내용 전체를 메모리에 올려 비교하지 않기 위함
+    # 어셋 형식이 여러 개면 레코드를 한 번만 읽어 모든 기록기에 넘긴다.
+    def write_asset(self, datas, type_info_root, table_name):
+        writers = self.create_asset_writers(type_info_root, table_name)
+        result = TableExportResult(table_name)
 
         try:
-            with open(asset_file_path, 'r', encoding='utf8') as datafile:
-                old_dump = datafile.read()
-        except FileNotFoundError:
-            pass
+            for writer in writers:
+                writer.open()
+            for data in datas if datas is not None else []:
+                for writer in writers:
+                    writer.write_record(data)
+            for writer in writers:
+                writer.close()
+
+            # 모든 어셋을 다 쓴 뒤에 교체해 일부 형식만 바뀐 채로 남지 않게 함
+            for writer in writers:
+                result.asset_write_statuses[writer.file_path] = writer.commit()
+                result.asset_digests[os.path.basename(writer.file_path)] = writer.digest
+        except Exception as e:
+            for writer in writers:
+                writer.discard()
+            raise e
 
-        new_dump = json.dumps(data, indent=4, ensure_ascii=False)
+        return result
 
-        write_status = ''
-        
-        if old_dump != new_dump:
-            with open(asset_file_path, 'w', encoding='utf8') as datafile:
-                datafile.write(new_dump)
-            write_status = 'Written'
-        else:
-            write_status = 'Skipped'
 
-        print('{}: {}'.format(asset_file_path, write_status))
\ No newline at end of file
+##################################################
+# 병렬 내보내기 워커 프로세스
+##################################################
+
+# 워커 프로세스마다 스키마 캐시를 따로 갖는 DataExporter
+_worker_exporter = None
+
+def _init_export_worker(config_json, profiles, traces_memory):
+    global _worker_exporter
+    _worker_exporter = DataExporter(config_json, StageProfiler(traces_memory) if profiles else None)
+
+# 워커에서 기록한 단계 이벤트는 결과에 담아 부모 프로세스의 기록기로 보낸다.
+def _export_table_in_worker(table_name):
+    try:
+        result = _worker_exporter.export_table(table_name)
+    finally:
+        profile_events = _worker_exporter.profiler.pop_events() if _worker_exporter.profiler is not None else []
+
+    result.profile_events = profile_events
+    return result
\ No newline at end of file
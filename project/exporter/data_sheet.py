@@ -0,0 +1,116 @@
+from array import array
+from bisect import bisect_left
+from openpyxl.utils import get_column_letter
+
+# 엑셀 Data 시트의 셀 값 그리드
+# 워크시트를 행 단위로 한 번만 읽어 컬럼별 값 목록으로 보관한다.
+class DataSheet:
+    def __init__(self):
+        self.columns = []   # [[셀 값, ...]] 컬럼별 1행부터의 값. 모든 컬럼의 길이는 max_row
+        self.row_cols = []      # [array] 행별로 값이 있는 컬럼 인덱스. 컬럼 순서
+        self.next_rows = []     # [array] 컬럼별로 각 행 이후(포함) 값이 있는 첫 행. 없으면 max_row + 1
+        self.max_row = 0
+        self.max_column = 0
+
+    def append_row(self, values):
+        row_idx = len(self.row_cols) + 1
+        self.append_cells(row_idx, [(col_idx, value) for col_idx, value in enumerate(values, 1) if value is not None])
+
+    # 값이 있는 셀만 받아 행을 추가한다. 지정한 행 앞까지 건너뛴 행은 빈 행으로 채운다.
+    # @param cells [(컬럼 인덱스, 값)] 컬럼 순서
+    def append_cells(self, row_idx, cells):
+        # 빈 행은 바뀌지 않으므로 빈 배열 하나를 같이 씀
+        self.row_cols.extend([array('i')] * (row_idx - 1 - len(self.row_cols)))
+
+        columns = self.columns
+        for col_idx, value in cells:
+            # 처음 값이 나온 컬럼은 이전 행들을 빈 값으로 채워 생성
+            while len(columns) < col_idx:
+                columns.append([])
+            column = columns[col_idx - 1]
+            if len(column) < row_idx - 1:
+                column.extend([None] * (row_idx - 1 - len(column)))
+
+            column.append(value)
+
+        self.row_cols.append(array('i', [col_idx for col_idx, _ in cells]))
+
+        if len(cells) > 0:
+            self.max_row = row_idx
+            self.max_column = max(self.max_column, cells[-1][0])
+
+    # 마지막 값 있는 행 이후의 빈 행을 제거하고 모든 컬럼을 max_row 길이로 맞춘다.
+    # 다음 값 있는 행 색인도 이 때 함께 만든다.
+    def trim(self):
+        del self.row_cols[self.max_row:]
+
+        for column in self.columns:
+            column.extend([None] * (self.max_row - len(column)))
+
+        self.build_next_index()
+
+    # 컬럼별 다음 값 있는 행을 뒤에서부터 한 번씩 훑어 구한다.
+    # 인덱스는 1부터 사용하며 [max_row + 1] 은 '없음' 을 나타낸다.
+    # 다음 값 있는 컬럼은 행마다 컬럼 수만큼 만들지 않고 row_cols 에서 이진 탐색한다.
+    def build_next_index(self):
+        no_row = self.max_row + 1
+
+        self.next_rows = []
+        for column in self.columns:
+            next_row = array('i', [no_row]) * (self.max_row + 2)
+            for row_idx in range(self.max_row, 0, -1):
+                next_row[row_idx] = row_idx if column[row_idx - 1] is not None else next_row[row_idx + 1]
+            self.next_rows.append(next_row)
+
+    def value(self, row_idx, col_idx):
+        if row_idx > self.max_row or col_idx > self.max_column:
+            return None
+
+        return self.columns[col_idx - 1][row_idx - 1]
+
+    # 컬럼에서 지정한 행 이후(포함) 값이 있는 첫 행. 없으면 max_row + 1
+    def find_next_row(self, col_idx, row_idx):
+        if col_idx > self.max_column or row_idx > self.max_row:
+            return self.max_row + 1
+
+        return self.next_rows[col_idx - 1][row_idx]
+
+    # 행에서 지정한 컬럼 이후(포함) 값이 있는 첫 컬럼. 없으면 max_column + 1
+    def find_next_column(self, row_idx, col_idx):
+        if row_idx > self.max_row or col_idx > self.max_column:
+            return self.max_column + 1
+
+        row_cols = self.row_cols[row_idx - 1]
+        idx = bisect_left(row_cols, col_idx)
+        return row_cols[idx] if idx < len(row_cols) else self.max_column + 1
+
+    # 값이 있는 셀 수
+    def count_values(self):
+        return sum(len(column) - column.count(None) for column in self.columns)
+
+    # 행의 컬럼 범위에 값이 하나도 없는지 확인
+    def is_empty_row(self, row_idx, col_idx_start, col_idx_max):
+        return self.find_next_column(row_idx, col_idx_start) > col_idx_max
+
+    @staticmethod
+    def coordinate(row_idx, col_idx):
+        return '{}{}'.format(get_column_letter(col_idx), row_idx)
+
+    # read_only 모드 워크시트를 행 순서대로 읽어 그리드를 만든다.
+    # read_only 모드는 시트 크기(<dimension>) 밖의 셀을 버리는데 다른 도구가 쓴 크기는 틀린 경우가 많다.
+    # 전체 모드처럼 파일에 있는 셀을 모두 읽도록 크기를 지운다.
+    @staticmethod
+    def from_worksheet(ws):
+        if hasattr(ws, 'reset_dimensions'):
+            ws.reset_dimensions()
+        else:
+            ws._max_row = None
+            ws._max_column = None
+
+        sheet = DataSheet()
+
+        for row in ws.iter_rows(values_only=True):
+            sheet.append_row(row)
+
+        sheet.trim()
+        return sheet
@@ -0,0 +1,23 @@
+# 타입 정보 트리와 헤더 정보 트리를 합쳐 미리 만들어 둔 디코딩 단계
+# 행마다 멤버 검색, 리프/배열 분기, 파싱 타입 분기를 반복하지 않기 위함
+class DecodeStep:
+    def __init__(self):
+        self.key = None         # 출력 데이터의 필드명
+        self.col_idx = 0        # 값을 읽을 컬럼
+        self.is_array = False   # True: 읽은 값들을 배열 필드에 이어 붙임
+        self.parser = None      # 리프: 셀 값 -> 데이터 값 변환 함수
+        self.constraint = None  # 리프: ValueConstraint. 없으면 None
+        self.sub_plan = None    # 구조체: 멤버 디코딩 계획
+        self.load = None        # 값 읽기 함수. (sheet, step, row_start, row_end) -> 값 또는 None
+
+# 오브젝트 노드 하나의 디코딩 계획
+class DecodePlan:
+    def __init__(self, col_start, col_end):
+        self.col_start = col_start  # 빈 행 판정에 쓰는 헤더 컬럼 범위
+        self.col_end = col_end
+        self.steps = []    # [DecodeStep] 헤더 컬럼 순서
+        self.required_members = []  # [(필드명, 컬럼)] 빠졌을 때 오류 위치로 알릴 컬럼과 함께 기록
+        self.unique_keys = []   # [(필드명, 컬럼)] 배열 항목 사이에 값이 겹치면 안 되는 필드
+
+    def add_step(self, step):
+        self.steps.append(step)
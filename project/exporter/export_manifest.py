@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+
+# 테이블별로 마지막 내보내기 때의 입력 파일 해시를 기록한 매니페스트
+# 입력(엑셀, 테이블 스키마, 참조 스키마)과 어셋이 그대로라면 엑셀을 열지 않고 건너뛴다.
+# 해시 옆에 파일 수정 시각, 크기를 함께 기록해, 둘 다 같은 파일은 내용을 다시 해시하지 않는다. (SheetCache 와 같음)
+class ExportManifest:
+    FILE_NAME = '.export_manifest.json'
+    VERSION = 4     # 내보내기 결과 형식이나 엑셀 읽는 방식이 바뀌면 올려서 기존 기록을 무효화
+
+    def __init__(self, asset_dir_path):
+        self.file_path = os.path.join(asset_dir_path, ExportManifest.FILE_NAME)
+        # { 테이블명 : { 'inputs': { 파일명 : 해시 }, 'input_stats': { 파일명 : [수정 시각 ns, 크기] },
+        #               'assets': { 어셋 파일명 : 해시 }, 'asset_stats': { 어셋 파일명 : [수정 시각 ns, 크기] }, 'strict': 전체 스키마 검사 여부 } }
+        self.tables = {}
+
+    def load(self):
+        try:
+            with open(self.file_path, 'r', encoding='utf8') as fp:
+                manifest_json = json.load(fp)
+        except FileNotFoundError:
+            return
+
+        if manifest_json.get('version') == ExportManifest.VERSION:
+            self.tables = manifest_json['tables']
+
+    def save(self):
+        manifest_json = {
+            'version': ExportManifest.VERSION,
+            'tables': self.tables
+        }
+
+        with open(self.file_path, 'w', encoding='utf8') as fp:
+            json.dump(manifest_json, fp, indent=4, sort_keys=True, ensure_ascii=False)
+
+    def find_entry(self, table_name):
+        return self.tables.get(table_name)
+
+    def set_entry(self, table_name, entry):
+        self.tables[table_name] = entry
+
+    @staticmethod
+    def create_entry(input_hashes, input_stats, asset_digests, asset_stats, strict):
+        return {
+            'inputs': input_hashes,
+            'input_stats': input_stats,
+            'assets': asset_digests,
+            'asset_stats': asset_stats,
+            'strict': strict
+        }
+
+    # 입력 해시가 기록과 같고 어셋 파일도 기록 당시 그대로인지 확인
+    # strict 검사를 요청했다면 기록 당시에도 strict 검사를 했어야 함
+    # 설정이 바뀌어 내보낼 어셋 형식이 달라졌다면 다시 내보낸다.
+    # @return 그대로라면 어셋 수정 시각, 크기를 지금 값으로 갱신한 기록. 아니면 None
+    def find_up_to_date_entry(self, table_name, input_hashes, input_stats, asset_file_paths, strict):
+        entry = self.find_entry(table_name)
+        if entry is None or entry['inputs'] != input_hashes:
+            return None
+
+        if strict and not entry.get('strict', False):
+            return None
+
+        asset_digests = entry['assets']
+        if set(asset_digests) != set(os.path.basename(path) for path in asset_file_paths):
+            return None
+
+        asset_stats = {}
+        try:
+            for asset_file_path in asset_file_paths:
+                asset_file_name = os.path.basename(asset_file_path)
+                asset_digest, asset_stats[asset_file_name] = ExportManifest.hash_file_if_changed(asset_file_path, asset_file_name, asset_digests, entry['asset_stats'])
+                if asset_digest != asset_digests[asset_file_name]:
+                    return None
+        except FileNotFoundError:
+            return None
+
+        return ExportManifest.create_entry(input_hashes, input_stats, asset_digests, asset_stats, entry.get('strict', False))
+
+    # 이전 기록의 수정 시각, 크기가 지금과 같으면 기록한 해시를 쓰고, 다르면 내용을 해시한다.
+    # @param digests, stats 이전 기록의 { 파일명 : 해시 }, { 파일명 : [수정 시각 ns, 크기] }
+    # @return 해시, [수정 시각 ns, 크기]
+    @staticmethod
+    def hash_file_if_changed(file_path, file_name, digests, stats):
+        file_stat = os.stat(file_path)
+        stat = [file_stat.st_mtime_ns, file_stat.st_size]
+
+        if stats.get(file_name) == stat and file_name in digests:
+            return digests[file_name], stat
+
+        return ExportManifest.hash_file(file_path), stat
+
+    # @return { 파일명 : [수정 시각 ns, 크기] }
+    @staticmethod
+    def stat_files(file_paths):
+        stats = {}
+
+        for file_path in file_paths:
+            file_stat = os.stat(file_path)
+            stats[os.path.basename(file_path)] = [file_stat.st_mtime_ns, file_stat.st_size]
+
+        return stats
+
+    @staticmethod
+    def hash_file(file_path):
+        file_hash = hashlib.sha256()
+
+        with open(file_path, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(1024 * 1024), b''):
+                file_hash.update(chunk)
+
+        return file_hash.hexdigest()
@@ -2,20 +2,39 @@ import os
 
 # 데이터 시트의 헤더 정보 노드
 class HeaderNode:
+    __slots__ = ['name', 'col_start', 'col_end', 'members', 'members_by_name', 'cached_paths']
+
     def __init__(self, name, col_start, col_end):
         self.name = name
         self.col_start = col_start
         self.col_end = col_end
         self.members = []    # [HeaderNode]
+        self.members_by_name = {}   # { 이름 : HeaderNode } 이름이 같은 컬럼이 여럿이면 처음 추가한 멤버
+        self.cached_paths = {}  # { (이름, ...) : HeaderNode 또는 None } find_path() 결과
 
     def add_member(self, member):
         self.members.append(member)
+        self.members_by_name.setdefault(member.name, member)
 
     def find_member(self, name):
-        for member in self.members:
-            if member.name == name:
-                return member
-        return None
+        return self.members_by_name.get(name)
+
+    # 이름 경로의 하위 노드를 찾는다. 없으면 None
+    # 앞부분 경로의 결과도 함께 기억하므로 트리를 다 만든 뒤에만 사용한다.
+    # 헤더 트리는 내보낼 때마다 새로 만들므로 기억한 결과도 그 내보내기 동안만 쓰인다.
+    def find_path(self, node_path):
+        node_path = tuple(node_path)
+        if node_path in self.cached_paths:
+            return self.cached_paths[node_path]
+
+        if len(node_path) == 0:
+            node = self
+        else:
+            parent = self.find_path(node_path[:-1])
+            node = parent.find_member(node_path[-1]) if parent is not None else None
+
+        self.cached_paths[node_path] = node
+        return node
 
     def to_string(self, depth):
         text = ''
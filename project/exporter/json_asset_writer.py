@@ -0,0 +1,52 @@
+import json
+import os
+from exporter.asset_writer import AssetWriter
+
+# 레코드 단위로 JSON 어셋을 쓰는 기록기
+# json.dumps(datas, indent=4, ensure_ascii=False) 와 같은 내용을 임시 파일에 이어 쓰면서 해시를 구한다.
+class JsonAssetWriter(AssetWriter):
+    INDENT = '    '
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.record_count = 0
+        self.record_offsets = []
+        self.size = 0   # 지금까지 쓴 바이트 수
+
+    def open(self):
+        self.fp = open(self.temp_file_path, 'w', encoding='utf8')
+
+    def write_record(self, record):
+        # 최상위 배열 항목은 한 단계 들여쓰기
+        # 문자열 안의 줄바꿈은 이스케이프되므로 줄바꿈 문자는 모두 서식용
+        record_dump = json.dumps(record, indent=4, ensure_ascii=False).replace('\n', '\n' + JsonAssetWriter.INDENT)
+
+        if self.record_count == 0:
+            self.write_text('[\n' + JsonAssetWriter.INDENT)
+        else:
+            self.write_text(',\n' + JsonAssetWriter.INDENT)
+
+        self.record_offsets.append(self.size)
+        self.write_text(record_dump)
+        self.record_count += 1
+
+    def close(self):
+        # 항목이 하나도 없으면 load_node_array() 결과와 같이 null
+        if self.record_count == 0:
+            self.write_text('null')
+        else:
+            self.write_text('\n]')
+
+        self.fp.close()
+        self.fp = None
+        self.digest = self.hash.hexdigest()
+
+    def write_text(self, text):
+        self.fp.write(text)
+
+        # 텍스트 모드 쓰기는 줄바꿈을 os.linesep 으로 바꾸므로 해시도 디스크에 쓰인 내용 기준으로 구한다.
+        if os.linesep != '\n':
+            text = text.replace('\n', os.linesep)
+        encoded = text.encode('utf8')
+        self.hash.update(encoded)
+        self.size += len(encoded)
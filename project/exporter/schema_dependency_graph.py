@@ -0,0 +1,51 @@
+# 스키마 파일 사이의 $ref 참조 관계
+# 공용 스키마가 바뀌었을 때 영향받는 스키마만 찾기 위함
+class SchemaDependencyGraph:
+    def __init__(self):
+        self.refs = {}  # { 파일명 : set(참조하는 스키마 파일명) }
+
+    def add_ref(self, schema_file_name, ref_schema_file_name):
+        # 같은 파일 내 참조는 기록하지 않음
+        if schema_file_name == ref_schema_file_name:
+            return
+
+        self.refs.setdefault(schema_file_name, set()).add(ref_schema_file_name)
+
+    # 스키마 파일이 바뀌면 그 파일에서 나가는 참조는 다시 따라가며 기록해야 함
+    def remove_refs(self, schema_file_name):
+        self.refs.pop(schema_file_name, None)
+
+    # 스키마 파일 자신과 직/간접 참조하는 스키마 파일명 목록
+    def find_dependencies(self, schema_file_name):
+        dependencies = set()
+        pending = [schema_file_name]
+
+        while len(pending) > 0:
+            file_name = pending.pop()
+            if file_name in dependencies:
+                continue
+
+            dependencies.add(file_name)
+            pending.extend(self.refs.get(file_name, ()))
+
+        return sorted(dependencies)
+
+    # 바뀐 스키마 파일들과 그 파일들을 직/간접 참조하는 스키마 파일명 목록
+    def find_dependents(self, schema_file_names):
+        referrers = {}  # { 파일명 : set(이 파일을 참조하는 파일명) }
+        for file_name, ref_file_names in self.refs.items():
+            for ref_file_name in ref_file_names:
+                referrers.setdefault(ref_file_name, set()).add(file_name)
+
+        dependents = set()
+        pending = list(schema_file_names)
+
+        while len(pending) > 0:
+            file_name = pending.pop()
+            if file_name in dependents:
+                continue
+
+            dependents.add(file_name)
+            pending.extend(referrers.get(file_name, ()))
+
+        return sorted(dependents)
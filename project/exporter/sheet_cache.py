@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from exporter.export_manifest import ExportManifest
+
+# 엑셀 파일별로 읽어둔 DataSheet 를 디스크에 보관하는 캐시
+# 같은 엑셀을 다시 읽을 때 load_workbook() 없이 그리드를 복원한다.
+#
+# stat/<경로 해시>.json    : 엑셀 경로의 수정 시각, 크기, 내용 해시
+# sheets/<내용 해시>.pickle : DataSheet. 파일 수정 시각을 최근 사용 시각으로 써서 LRU 로 제거
+class SheetCache:
+    VERSION = 3     # DataSheet 구조나 읽는 방식이 바뀌면 올려서 기존 캐시를 쓰지 않게 함
+
+    def __init__(self, cache_dir_path, max_bytes):
+        self.cache_dir_path = cache_dir_path
+        self.stat_dir_path = os.path.join(cache_dir_path, 'stat')
+        self.sheet_dir_path = os.path.join(cache_dir_path, 'sheets')
+        self.max_bytes = max_bytes
+
+    # @return 캐시된 DataSheet (없으면 None), 엑셀 파일 내용 해시
+    def find(self, file_path):
+        file_stat = os.stat(file_path)
+        stat_file_path = self.get_stat_file_path(file_path)
+
+        # 수정 시각, 크기가 같으면 기록해둔 내용 해시를 믿는다.
+        content_hash = None
+        try:
+            with open(stat_file_path, 'r', encoding='utf8') as fp:
+                stat_json = json.load(fp)
+            if stat_json['mtime_ns'] == file_stat.st_mtime_ns and stat_json['size'] == file_stat.st_size:
+                content_hash = stat_json['hash']
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+        # 수정 시각만 바뀐 경우(체크아웃 등) 내용이 같으면 그대로 사용
+        if content_hash is None:
+            content_hash = ExportManifest.hash_file(file_path)
+            self.write_stat(stat_file_path, file_stat, content_hash)
+
+        sheet_file_path = self.get_sheet_file_path(content_hash)
+        try:
+            with open(sheet_file_path, 'rb') as fp:
+                sheet = pickle.load(fp)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None, content_hash
+
+        os.utime(sheet_file_path)
+        return sheet, content_hash
+
+    def save(self, content_hash, sheet):
+        os.makedirs(self.sheet_dir_path, exist_ok=True)
+
+        sheet_file_path = self.get_sheet_file_path(content_hash)
+        temp_file_path = '{}.{}.tmp'.format(sheet_file_path, os.getpid())
+        with open(temp_file_path, 'wb') as fp:
+            pickle.dump(sheet, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file_path, sheet_file_path)
+
+        self.evict()
+
+    # 전체 크기가 한도를 넘으면 오래 사용하지 않은 시트부터 제거
+    def evict(self):
+        entries = []
+        total_bytes = 0
+
+        for entry in os.scandir(self.sheet_dir_path):
+            if not entry.name.endswith('.pickle'):
+                continue
+
+            entry_stat = entry.stat()
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry.path))
+            total_bytes += entry_stat.st_size
+
+        entries.sort()
+        for _, entry_size, entry_path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= entry_size
+
+    def clear(self):
+        for dir_path in [self.stat_dir_path, self.sheet_dir_path]:
+            if os.path.isdir(dir_path):
+                shutil.rmtree(dir_path)
+
+    def write_stat(self, stat_file_path, file_stat, content_hash):
+        os.makedirs(self.stat_dir_path, exist_ok=True)
+
+        stat_json = {
+            'mtime_ns': file_stat.st_mtime_ns,
+            'size': file_stat.st_size,
+            'hash': content_hash
+        }
+
+        temp_file_path = '{}.{}.tmp'.format(stat_file_path, os.getpid())
+        with open(temp_file_path, 'w', encoding='utf8') as fp:
+            json.dump(stat_json, fp)
+        os.replace(temp_file_path, stat_file_path)
+
+    def get_stat_file_path(self, file_path):
+        path_hash = hashlib.sha1(os.path.abspath(file_path).encode('utf8')).hexdigest()
+        return os.path.join(self.stat_dir_path, path_hash + '.json')
+
+    def get_sheet_file_path(self, content_hash):
+        return os.path.join(self.sheet_dir_path, '{}.v{}.pickle'.format(content_hash, SheetCache.VERSION))
@@ -0,0 +1,41 @@
+import json
+import os
+from exporter.asset_writer import AssetWriter
+
+# 정렬 키로 정렬해 내보낸 어셋의 색인을 쓰는 기록기
+# 레코드 순서대로 키 값과, 어셋 형식별 레코드 시작 바이트 위치를 기록한다.
+# 클라이언트는 어셋 전체를 읽지 않고 키를 이진 탐색해 해당 레코드만 읽을 수 있다.
+#  { "key": 키 이름, "keys": [키 값], "offsets": { 어셋 파일명 : [바이트 위치] } }
+# 키 값 목록의 인덱스가 레코드 순번이며 키가 없는 레코드는 null (정렬 시 맨 뒤)
+class SortIndexWriter(AssetWriter):
+    def __init__(self, file_path, key_name, asset_writers):
+        super().__init__(file_path)
+        self.key_name = key_name
+        self.asset_writers = asset_writers  # [AssetWriter] 이 기록기보다 먼저 닫혀야 함
+        self.keys = []
+
+    def open(self):
+        self.fp = open(self.temp_file_path, 'w', encoding='utf8', newline='\n')
+
+    def write_record(self, record):
+        self.keys.append(record.get(self.key_name))
+
+    def close(self):
+        offsets = {}
+        for writer in self.asset_writers:
+            if writer.record_offsets is not None:
+                offsets[os.path.basename(writer.file_path)] = writer.record_offsets
+
+        index = {
+            'key': self.key_name,
+            'keys': self.keys,
+            'offsets': offsets
+        }
+        text = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+
+        self.fp.write(text)
+        self.hash.update(text.encode('utf8'))
+
+        self.fp.close()
+        self.fp = None
+        self.digest = self.hash.hexdigest()
@@ -0,0 +1,227 @@
+import json
+import os
+import platform
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None     # Windows
+
+# 측정 중인 단계 하나. 단계 안에서 counts 에 행/셀 수 등을 기록한다.
+class ProfileStage:
+    def __init__(self, name, category, target):
+        self.name = name
+        self.category = category    # 'export', 'code'
+        self.target = target        # 테이블명 또는 스키마 파일명
+        self.counts = {}    # { 이름 : 수 } 예) rows, cells, records
+        self.start_time = 0     # 시작 시각 (epoch 초)
+        self.wall_seconds = 0
+        self.cpu_seconds = 0
+        self.traced_peak_bytes = 0  # tracemalloc 최대 메모리. 하위 단계 포함
+        self.traced_start_bytes = 0     # 시작할 때의 tracemalloc 현재 메모리. reset_peak() 가 없을 때 사용
+        self.traced_start_peak_bytes = 0    # 시작할 때의 tracemalloc 최대 메모리. reset_peak() 가 없을 때 사용
+        self.wall_start = 0     # perf_counter() 시작 값
+        self.cpu_start = 0      # process_time() 시작 값
+
+    def to_event(self):
+        event = {
+            'name': self.name,
+            'category': self.category,
+            'target': self.target,
+            'start_time': self.start_time,
+            'wall_seconds': self.wall_seconds,
+            'cpu_seconds': self.cpu_seconds,
+            'max_rss_bytes': StageProfiler.get_max_rss_bytes(),
+            'counts': self.counts,
+            'pid': os.getpid(),
+            'tid': StageProfiler.get_thread_id()
+        }
+
+        if tracemalloc.is_tracing():
+            event['traced_peak_bytes'] = self.traced_peak_bytes
+
+        return event
+
+# 측정하지 않을 때 쓰는 단계. counts 기록은 받되 아무것도 남기지 않는다.
+class NullProfileStage:
+    def __init__(self):
+        self.counts = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+# DataExporter, CodeGenerator 의 단계별 실행 시간, CPU 시간, 메모리, 처리량 기록기
+#
+# 단계가 끝날 때마다 이벤트 dict 를 쌓고 등록된 훅을 호출한다.
+#  - 훅: add_hook(함수). 함수는 이벤트 dict 하나를 받음 (자체 지표 시스템으로 보낼 때 사용)
+#  - 저장: save(경로). Chrome trace event 형식으로 chrome://tracing, Perfetto 에서 열 수 있음
+# 병렬 내보내기 워커는 자기 기록기에 쌓은 이벤트를 결과에 담아 보내고, 부모가 add_events() 로 합친다.
+class StageProfiler:
+    def __init__(self, traces_memory=False):
+        self.traces_memory = traces_memory  # True: tracemalloc 으로 단계별 최대 메모리 기록 (실행이 느려짐)
+        self.events = []    # [이벤트 dict]
+        self.hooks = []     # [함수(이벤트 dict)]
+        self.stage_stack = []   # [ProfileStage] 진행 중인 단계
+
+        if traces_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def add_events(self, events):
+        for event in events:
+            self.add_event(event)
+
+    def add_event(self, event):
+        self.events.append(event)
+        for hook in self.hooks:
+            hook(event)
+
+    # 지금까지 쌓인 이벤트를 꺼내고 비운다.
+    def pop_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+    # with profiler.stage('load_workbook', 'export', table_name) as stage:
+    def stage(self, name, category, target):
+        return StageContext(self, ProfileStage(name, category, target))
+
+    # 레코드를 읽는 제너레이터처럼 다른 단계와 번갈아 실행되는 단계는 항목을 꺼내는 시간만 합산한다.
+    # 항목 수를 counts[count_name] 에 기록하며, 끝까지 꺼낸 뒤 이벤트 하나를 남긴다.
+    def iter_stage(self, name, category, target, iterable, count_name):
+        stage = ProfileStage(name, category, target)
+        stage.start_time = time.time()
+        count = 0
+        iterator = iter(iterable)
+
+        while True:
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                stage.wall_seconds += time.perf_counter() - wall_start
+                stage.cpu_seconds += time.process_time() - cpu_start
+
+            count += 1
+            yield item
+
+        stage.counts[count_name] = count
+        if tracemalloc.is_tracing():
+            stage.traced_peak_bytes = tracemalloc.get_traced_memory()[1]
+        self.add_event(stage.to_event())
+
+    def begin_stage(self, stage):
+        # 하위 단계가 최대값을 초기화하기 전에 상위 단계들에 지금까지의 최대값을 반영
+        if tracemalloc.is_tracing():
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            for parent_stage in self.stage_stack:
+                parent_stage.traced_peak_bytes = max(parent_stage.traced_peak_bytes, peak_bytes)
+
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            else:
+                stage.traced_start_bytes = current_bytes
+                stage.traced_start_peak_bytes = peak_bytes
+
+        self.stage_stack.append(stage)
+        stage.start_time = time.time()
+        stage.wall_start = time.perf_counter()
+        stage.cpu_start = time.process_time()
+
+    def end_stage(self, stage):
+        stage.wall_seconds = time.perf_counter() - stage.wall_start
+        stage.cpu_seconds = time.process_time() - stage.cpu_start
+
+        if tracemalloc.is_tracing():
+            stage.traced_peak_bytes = max(stage.traced_peak_bytes, StageProfiler.get_stage_peak_bytes(stage))
+
+        self.stage_stack.remove(stage)
+        if len(self.stage_stack) > 0:
+            self.stage_stack[-1].traced_peak_bytes = max(self.stage_stack[-1].traced_peak_bytes, stage.traced_peak_bytes)
+
+        self.add_event(stage.to_event())
+
+    def save(self, trace_file_path):
+        trace = {
+            'traceEvents': [StageProfiler.to_trace_event(event) for event in self.events],
+            'displayTimeUnit': 'ms'
+        }
+
+        with open(trace_file_path, 'w', encoding='utf8') as fp:
+            json.dump(trace, fp, ensure_ascii=False)
+
+    # Chrome trace event 형식의 완료 이벤트 ('X'). 시간 단위는 마이크로초
+    @staticmethod
+    def to_trace_event(event):
+        args = {
+            'target': event['target'],
+            'cpu_ms': event['cpu_seconds'] * 1000,
+            'max_rss_bytes': event['max_rss_bytes']
+        }
+        if 'traced_peak_bytes' in event:
+            args['traced_peak_bytes'] = event['traced_peak_bytes']
+        args.update(event['counts'])
+
+        return {
+            'name': event['name'],
+            'cat': event['category'],
+            'ph': 'X',
+            'ts': int(event['start_time'] * 1000000),
+            'dur': int(event['wall_seconds'] * 1000000),
+            'pid': event['pid'],
+            'tid': event['tid'],
+            'args': args
+        }
+
+    # 단계 시작 이후의 tracemalloc 최대 메모리
+    # reset_peak() 가 없으면(파이썬 3.8 이하) 최대값을 초기화할 수 없으므로, 단계 중에 최대값이 올라가지 않았다면
+    # 단계 시작과 끝의 현재 메모리 중 큰 값을 쓴다. (실제 최대값보다 작을 수 있음)
+    @staticmethod
+    def get_stage_peak_bytes(stage):
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak') or peak_bytes > stage.traced_start_peak_bytes:
+            return peak_bytes
+
+        return max(stage.traced_start_bytes, current_bytes)
+
+    # 운영체제 스레드 ID. get_native_id() 가 없으면(파이썬 3.7) 파이썬 스레드 ID
+    @staticmethod
+    def get_thread_id():
+        if hasattr(threading, 'get_native_id'):
+            return threading.get_native_id()
+
+        return threading.get_ident()
+
+    # 프로세스 최대 RSS. 측정할 수 없으면 None
+    @staticmethod
+    def get_max_rss_bytes():
+        if resource is None:
+            return None
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 는 바이트, 리눅스는 KB 단위
+        return max_rss if platform.system() == 'Darwin' else max_rss * 1024
+
+class StageContext:
+    def __init__(self, profiler, stage):
+        self.profiler = profiler
+        self.stage = stage
+
+    def __enter__(self):
+        self.profiler.begin_stage(self.stage)
+        return self.stage
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.end_stage(self.stage)
+        return False
@@ -0,0 +1,35 @@
+# 테이블 하나를 내보낸 결과
+class TableExportResult:
+    def __init__(self, table_name):
+        self.table_name = table_name
+        self.asset_write_statuses = {}  # { 어셋 파일 경로 : 'Written' or 'Skipped' }
+        self.asset_digests = {}     # { 어셋 파일명 : 내용 해시 } 입력이 그대로여서 건너뛴 경우 비어 있음
+        self.manifest_entry = None  # 매니페스트에 새로 기록할 정보. 입력이 그대로여서 건너뛰었고 기록할 변경도 없으면 None
+        self.profile_events = []    # 병렬 내보내기 워커에서 기록한 단계 이벤트 (StageProfiler)
+        self.profile_file_paths = []    # 테이블 프로파일러가 쓴 파일 경로 (TableProfiler)
+        self.error = None   # 실패한 경우 예외. 아래는 DataExporter.export_batch() 결과에서만 기록
+        self.error_traceback = None # 실패한 경우 예외 추적 문자열
+        self.seconds = 0    # 내보내는 데 걸린 시간
+        self.cpu_seconds = 0
+        self.stage_seconds = {}     # { 단계명 : 초 } DataExporter 에 StageProfiler 를 지정한 경우만 기록
+
+    # 'Written': 어셋을 하나라도 새로 씀, 'Skipped': 모든 어셋이 그대로, 'Failed': 실패
+    def get_status(self):
+        if self.error is not None:
+            return 'Failed'
+        if 'Written' in self.asset_write_statuses.values():
+            return 'Written'
+        return 'Skipped'
+
+    # 빌드 서비스가 그대로 응답으로 보낼 수 있는 dict
+    def to_json(self):
+        return {
+            'table_name': self.table_name,
+            'status': self.get_status(),
+            'assets': self.asset_write_statuses,
+            'error': '{}: {}'.format(type(self.error).__name__, self.error) if self.error is not None else None,
+            'seconds': self.seconds,
+            'cpu_seconds': self.cpu_seconds,
+            'stage_seconds': self.stage_seconds,
+            'profile_file_paths': self.profile_file_paths
+        }
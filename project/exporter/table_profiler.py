@@ -0,0 +1,86 @@
+import cProfile
+import os
+import sys
+import threading
+
+# 테이블 하나의 내보내기를 함수 단위로 측정하는 프로파일러
+# 다른 테이블에는 부담을 주지 않도록 지정한 테이블의 export_table() 호출만 감싼다.
+# 두 방식을 같이 켜면 서로의 부담이 결과에 섞이므로 한 번에 하나만 사용하며, 파일명에 방식을 넣는다.
+#  - 'cprofile': 테이블명.cprofile.prof. 모든 호출을 기록. python -m pstats, snakeviz 등으로 확인
+#  - 'sample': 테이블명.sample.collapsed. 호출 스택 샘플을 'a;b;c 샘플수' 한 줄씩 기록. flamegraph.pl, speedscope 로 확인
+class TableProfiler:
+    SAMPLE_INTERVAL = 0.001     # 초. 호출 스택 샘플 주기
+
+    def __init__(self, output_dir_path, table_name, mode='cprofile'):
+        self.output_dir_path = output_dir_path
+        self.table_name = table_name
+        self.mode = mode    # 'cprofile', 'sample'
+        self.stack_counts = {}  # { (바깥부터의 프레임 이름, ...) : 샘플 수 }
+        self.root_frame = None  # 이 프레임 아래의 호출 스택만 기록
+        self.stop_event = threading.Event()
+
+    def get_output_file_path(self):
+        extension = '.prof' if self.mode == 'cprofile' else '.collapsed'
+        return os.path.join(self.output_dir_path, '{}.{}{}'.format(self.table_name, self.mode, extension))
+
+    # func(*args) 를 지정한 방식으로 측정하며 실행한다.
+    # 실패해도 그때까지의 결과는 저장한다.
+    def run(self, func, *args):
+        os.makedirs(self.output_dir_path, exist_ok=True)
+
+        if self.mode == 'cprofile':
+            return self.run_cprofile(func, *args)
+
+        return self.run_sampling(func, *args)
+
+    def run_cprofile(self, func, *args):
+        profile = cProfile.Profile()
+
+        profile.enable()
+        try:
+            return func(*args)
+        finally:
+            profile.disable()
+            profile.dump_stats(self.get_output_file_path())
+
+    # 별도 스레드에서 호출 스택을 샘플링한다.
+    def run_sampling(self, func, *args):
+        self.root_frame = sys._getframe()
+        sampler = threading.Thread(target=self.sample_stacks, args=(threading.get_ident(),), daemon=True)
+
+        sampler.start()
+        try:
+            return func(*args)
+        finally:
+            self.stop_event.set()
+            sampler.join()
+            self.root_frame = None
+
+            self.save_collapsed_stacks()
+
+    def sample_stacks(self, thread_id):
+        while not self.stop_event.wait(TableProfiler.SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(thread_id)
+
+            stack = []
+            while frame is not None and frame is not self.root_frame:
+                stack.append(TableProfiler.get_frame_name(frame))
+                frame = frame.f_back
+
+            # run() 이 func 를 호출하기 전이나 끝난 뒤
+            if frame is None or len(stack) == 0:
+                continue
+
+            stack = tuple(reversed(stack))
+            self.stack_counts[stack] = self.stack_counts.get(stack, 0) + 1
+
+    def save_collapsed_stacks(self):
+        with open(self.get_output_file_path(), 'w', encoding='utf8') as fp:
+            for stack, count in sorted(self.stack_counts.items()):
+                fp.write('{} {}\n'.format(';'.join(stack), count))
+
+    # 예) load_node_object (data_exporter.py:568)
+    @staticmethod
+    def get_frame_name(frame):
+        code = frame.f_code
+        return '{} ({}:{})'.format(code.co_name, os.path.basename(code.co_filename), code.co_firstlineno)
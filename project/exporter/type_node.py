@@ -10,20 +10,25 @@ class TypeNodeParseType(Enum):
     STRING = 4
 
 class TypeNode:
+    __slots__ = ['name', 'is_array', 'parse_type', 'constraint', 'required', 'index_keys', 'sort_key', 'members', 'members_by_name']
+
     def __init__(self):
         self.name = None    # 필드명
         self.is_array = False
         self.parse_type = TypeNodeParseType.NONE
+        self.constraint = None  # ValueConstraint. 리프 노드의 값(배열이면 각 항목) 제약 조건
+        self.required = []  # [필드명] 오브젝트 노드(배열이면 각 항목)의 필수 멤버
+        self.index_keys = []    # [필드명] 배열 항목의 'x-index'. 첫 항목은 값이 겹치면 안 되는 기본 키
+        self.sort_key = None    # 필드명. 배열 항목의 'x-sort-key'. 내보낼 때 이 값 순서로 정렬
         self.members = []    # [TypeNode]
+        self.members_by_name = {}   # { 필드명 : TypeNode } 이름이 같은 멤버가 여럿이면 처음 추가한 멤버
 
     def add_member(self, member):
         self.members.append(member)
+        self.members_by_name.setdefault(member.name, member)
     
     def find_member(self, name):
-        for member in self.members:
-            if member.name == name:
-                return member
-        return None
+        return self.members_by_name.get(name)
 
     def is_leaf(self):
         return len(self.members) == 0
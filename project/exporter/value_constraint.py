@@ -0,0 +1,67 @@
+import re
+
+# 리프 값에 대한 스키마 제약 조건
+# parse_cell() 로 타입은 보장되므로 타입 외의 제약만 행을 읽으면서 검사한다.
+class ValueConstraint:
+    KEYWORDS = ['enum', 'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum', 'pattern']
+
+    def __init__(self):
+        self.enum = None
+        self.minimum = None
+        self.maximum = None
+        self.exclusive_minimum = None
+        self.exclusive_maximum = None
+        self.pattern = None     # 컴파일된 정규식
+
+    # @return 제약 조건이 없는 스키마면 None
+    @staticmethod
+    def from_schema(schema):
+        if not any(keyword in schema for keyword in ValueConstraint.KEYWORDS):
+            return None
+
+        constraint = ValueConstraint()
+        constraint.enum = schema.get('enum')
+        constraint.minimum = schema.get('minimum')
+        constraint.maximum = schema.get('maximum')
+        constraint.exclusive_minimum = schema.get('exclusiveMinimum')
+        constraint.exclusive_maximum = schema.get('exclusiveMaximum')
+        if 'pattern' in schema:
+            constraint.pattern = re.compile(schema['pattern'])
+        return constraint
+
+    # @return 위반 내용. 위반하지 않으면 None
+    def find_violation(self, value):
+        if self.enum is not None and value not in self.enum:
+            return '{!r} is not one of {!r}'.format(value, self.enum)
+
+        # 범위 조건은 숫자, 패턴 조건은 문자열에만 적용 (JSON Schema 와 같음)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if self.minimum is not None and value < self.minimum:
+                return '{!r} is less than the minimum of {!r}'.format(value, self.minimum)
+            if self.maximum is not None and value > self.maximum:
+                return '{!r} is greater than the maximum of {!r}'.format(value, self.maximum)
+            if self.exclusive_minimum is not None and value <= self.exclusive_minimum:
+                return '{!r} is less than or equal to the exclusive minimum of {!r}'.format(value, self.exclusive_minimum)
+            if self.exclusive_maximum is not None and value >= self.exclusive_maximum:
+                return '{!r} is greater than or equal to the exclusive maximum of {!r}'.format(value, self.exclusive_maximum)
+
+        if isinstance(value, str) and self.pattern is not None and self.pattern.search(value) is None:
+            return '{!r} does not match {!r}'.format(value, self.pattern.pattern)
+
+        return None
+
+    # 값 목록에서 처음으로 위반하는 값의 위치. 위반하지 않으면 None. 빈 값(None)은 건너뜀
+    def find_violation_index(self, values):
+        # 목록 조건만 있으면 위반 내용을 만들지 않고 바로 비교
+        if self.enum is not None and self.minimum is None and self.maximum is None and self.exclusive_minimum is None and self.exclusive_maximum is None and self.pattern is None:
+            enum = self.enum
+            for idx, value in enumerate(values):
+                if value is not None and value not in enum:
+                    return idx
+            return None
+
+        find_violation = self.find_violation
+        for idx, value in enumerate(values):
+            if value is not None and find_violation(value) is not None:
+                return idx
+        return None
@@ -0,0 +1,272 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from warnings import warn
+from openpyxl.cell.text import Text
+from openpyxl.reader.excel import ExcelReader
+from openpyxl.styles.stylesheet import apply_stylesheet
+from openpyxl.utils import column_index_from_string
+from openpyxl.utils.datetime import from_excel, from_ISO8601
+from openpyxl.xml.constants import SHEET_MAIN_NS
+from openpyxl.xml.functions import fromstring
+from exporter.data_sheet import DataSheet
+
+ROW_TAG = '{%s}row' % SHEET_MAIN_NS
+CELL_TAG = '{%s}c' % SHEET_MAIN_NS
+VALUE_TAG = '{%s}v' % SHEET_MAIN_NS
+INLINE_STRING_TAG = '{%s}is' % SHEET_MAIN_NS
+TEXT_TAG = '{%s}t' % SHEET_MAIN_NS
+
+XML_ENCODING_PATTERN = re.compile(rb'<\?xml[^>]*encoding=["\']([^"\']+)["\']')
+ROOT_START_PATTERN = re.compile(rb'<((?:[A-Za-z_][\w.-]*:)?worksheet)[\s>]')
+SHEET_DATA_START_PATTERN = re.compile(rb'<((?:[A-Za-z_][\w.-]*:)?)sheetData\s*(/?)>')
+
+# openpyxl 셀 객체를 만들지 않고 워크시트 XML 에서 값이 있는 셀만 읽어 DataSheet 를 만드는 리더
+# 공유 문자열, 날짜 서식, 시트 위치는 openpyxl ExcelReader 로 읽되 워크시트 객체는 만들지 않는다.
+# (read_only 워크시트는 만들 때 시트 크기를 구하려고, dimension 이 없는 시트는 XML 전체를 한 번 더 파싱함)
+# 셀 값은 openpyxl data_only 모드와 같다. 수식 셀은 저장된 계산 결과
+# 시트 크기(<dimension>)는 틀린 경우가 많으므로 쓰지 않고, 파일에 있는 행/셀을 모두 읽는다.
+#
+# sheetData 를 행 경계에서 CHUNK_BYTES 정도씩 잘라 C 파서로 한 번에 파싱하고 행/셀만 파이썬에서 훑는다.
+# jobs 가 2 이상이고 워크시트 XML 이 PARALLEL_MIN_BYTES 이상이면 잘라낸 행 묶음을 여러 프로세스에서 파싱한다.
+# 처리할 수 없는 형식이면 read() 가 None 을 돌려주며, 호출하는 쪽에서 openpyxl 로 읽는다.
+class XlsxSheetReader:
+    CHUNK_BYTES = 2 * 1024 * 1024
+    PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, archive, worksheet_path, shared_strings, date_formats, epoch, jobs=1):
+        self.archive = archive  # 엑셀 zip 파일
+        self.worksheet_path = worksheet_path    # zip 안의 워크시트 XML 경로
+        self.shared_strings = shared_strings    # [문자열]
+        self.date_formats = date_formats    # { 날짜 서식 스타일 인덱스 }
+        self.epoch = epoch
+        self.jobs = jobs    # 행 묶음을 동시에 파싱할 프로세스 수
+        self.column_indexes = {}    # { 컬럼 문자 : 컬럼 인덱스 }
+
+    # 엑셀 파일에서 시트 하나를 읽을 리더를 만든다. 시트가 없으면 None
+    @staticmethod
+    def open(file_path, sheet_name, jobs=1):
+        excel_reader = ExcelReader(file_path, read_only=True, data_only=True)
+        try:
+            excel_reader.read_manifest()
+            excel_reader.read_strings()
+            excel_reader.read_workbook()
+            apply_stylesheet(excel_reader.archive, excel_reader.wb)
+
+            for sheet, rel in excel_reader.parser.find_sheets():
+                if sheet.name == sheet_name and rel.target in excel_reader.valid_files and 'chartsheet' not in rel.Type:
+                    wb = excel_reader.wb
+                    return XlsxSheetReader(excel_reader.archive, rel.target, excel_reader.shared_strings, wb._date_formats, wb.epoch, jobs)
+        except:
+            excel_reader.archive.close()
+            raise
+
+        excel_reader.archive.close()
+        return None
+
+    def close(self):
+        self.archive.close()
+
+    # @return DataSheet. 처리할 수 없는 형식이면 None
+    def read(self):
+        with self.archive.open(self.worksheet_path) as src:
+            chunks = XlsxSheetReader.iter_row_chunks(src)
+
+            if self.jobs > 1 and self.archive.getinfo(self.worksheet_path).file_size >= XlsxSheetReader.PARALLEL_MIN_BYTES:
+                initargs = (self.shared_strings, self.date_formats, self.epoch)
+                with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_sheet_worker, initargs=initargs) as executor:
+                    return self.build_sheet(executor.map(_read_row_chunk_in_worker, chunks))
+
+            return self.build_sheet(self.read_row_chunk(chunk) for chunk in chunks)
+
+    # 행 묶음을 순서대로 받아 시트를 만든다.
+    # @param row_chunks [[(행 번호 또는 None, [(컬럼 인덱스, 값)])] 또는 None]
+    def build_sheet(self, row_chunks):
+        sheet = DataSheet()
+        row_idx = 0
+        next_row_idx = 1
+
+        for rows in row_chunks:
+            if rows is None:
+                return None
+
+            for row_number, cells in rows:
+                row_idx = row_number if row_number is not None else row_idx + 1
+
+                # openpyxl read_only 모드와 같이 앞 행보다 번호가 작은 행은 건너뜀
+                if row_idx >= next_row_idx:
+                    sheet.append_cells(row_idx, cells)
+                    next_row_idx = row_idx + 1
+
+        sheet.trim()
+        return sheet
+
+    # 워크시트 XML 에서 sheetData 안의 행들을 행 경계에서 잘라, 루트 태그로 감싼 XML 문서로 돌려준다.
+    # 루트 태그의 네임스페이스 선언을 그대로 쓰므로 잘라낸 조각만으로 파싱할 수 있다.
+    # 형식이 예상과 다르면 None 하나를 돌려준다.
+    @staticmethod
+    def iter_row_chunks(src):
+        buffer = b''
+        sheet_data_match = None
+
+        while sheet_data_match is None:
+            block = src.read(XlsxSheetReader.CHUNK_BYTES)
+            if len(block) == 0:
+                yield None
+                return
+
+            buffer += block
+            sheet_data_match = SHEET_DATA_START_PATTERN.search(buffer)
+
+        encoding_match = XML_ENCODING_PATTERN.match(buffer)
+        root_match = ROOT_START_PATTERN.search(buffer, 0, sheet_data_match.start())
+        if buffer.startswith((b'\xff\xfe', b'\xfe\xff')) or root_match is None:
+            yield None
+            return
+        if encoding_match is not None and encoding_match.group(1).lower() not in [b'utf-8', b'utf8']:
+            yield None
+            return
+
+        # 빈 시트 <sheetData/>
+        if sheet_data_match.group(2) == b'/':
+            return
+
+        root_start_tag = buffer[root_match.start():buffer.index(b'>', root_match.end() - 1) + 1]
+        root_end_tag = b'</' + root_match.group(1) + b'>'
+        prefix = sheet_data_match.group(1)
+        row_start = b'<' + prefix + b'row'
+        sheet_data_end = b'</' + prefix + b'sheetData>'
+
+        buffer = buffer[sheet_data_match.end():]
+        while True:
+            sheet_data_end_idx = buffer.find(sheet_data_end)
+            if sheet_data_end_idx >= 0:
+                if len(buffer[:sheet_data_end_idx].strip()) > 0:
+                    yield root_start_tag + buffer[:sheet_data_end_idx] + root_end_tag
+                return
+
+            block = src.read(XlsxSheetReader.CHUNK_BYTES)
+            if len(block) == 0:
+                yield None
+                return
+
+            # 마지막 행은 다음 블록과 이어질 수 있으므로 남겨둔다.
+            split_idx = buffer.rfind(row_start)
+            if split_idx > 0:
+                yield root_start_tag + buffer[:split_idx] + root_end_tag
+                buffer = buffer[split_idx:]
+
+            buffer += block
+
+    # 행 묶음 하나를 파싱한다. 행 번호가 없는 행은 None 으로 두고 build_sheet() 에서 앞 행 다음 번호를 쓴다.
+    # @return [(행 번호 또는 None, [(컬럼 인덱스, 값)])] 셀 위치가 기록되지 않은 셀이 있으면 None
+    def read_row_chunk(self, chunk):
+        if chunk is None:
+            return None
+
+        rows = []
+        for row_element in fromstring(chunk):
+            if row_element.tag != ROW_TAG:
+                continue
+
+            cells = self.read_row_cells(row_element)
+            if cells is None:
+                return None
+
+            row_number = row_element.get('r')
+            rows.append((int(row_number) if row_number else None, cells))
+
+        return rows
+
+    # @return [(컬럼 인덱스, 값)] 컬럼 순서. 셀 위치가 기록되지 않은 셀이 있으면 None
+    def read_row_cells(self, row_element):
+        cells = []
+        is_sorted = True
+        last_col_idx = 0
+        column_indexes = self.column_indexes
+        read_cell_value = self.read_cell_value
+
+        for cell_element in row_element:
+            if cell_element.tag != CELL_TAG:
+                continue
+
+            coordinate = cell_element.get('r')
+            if coordinate is None:
+                return None
+
+            column_letter = coordinate.rstrip('0123456789')
+            col_idx = column_indexes.get(column_letter)
+            if col_idx is None:
+                col_idx = column_index_from_string(column_letter)
+                column_indexes[column_letter] = col_idx
+
+            if col_idx <= last_col_idx:
+                is_sorted = False
+            last_col_idx = col_idx
+
+            # 순서대로 나오는 동안은 값이 없는 셀을 바로 버림. 뒤에 같은 위치의 셀이 나오면 그 값을 쓰므로 결과가 같다.
+            value = read_cell_value(cell_element, coordinate)
+            if value is not None or not is_sorted:
+                cells.append((col_idx, value))
+
+        if not is_sorted:
+            # 같은 위치의 셀이 여러 번 나오면 마지막 셀 값을 씀
+            values = dict(cells)
+            cells = [(col_idx, values[col_idx]) for col_idx in sorted(values) if values[col_idx] is not None]
+
+        return cells
+
+    # openpyxl WorkSheetParser.parse_cell() 의 data_only 값 변환과 같음
+    def read_cell_value(self, cell_element, coordinate):
+        data_type = cell_element.get('t', 'n')
+
+        if data_type == 'inlineStr':
+            inline_string = cell_element.find(INLINE_STRING_TAG)
+            if inline_string is None:
+                return None
+
+            # 서식 없는 문자열은 Text 객체를 만들지 않고 바로 읽음
+            if len(inline_string) == 1 and inline_string[0].tag == TEXT_TAG:
+                return inline_string[0].text or ''
+
+            return Text.from_tree(inline_string).content
+
+        value = cell_element.findtext(VALUE_TAG, None) or None
+        if value is None:
+            return None
+
+        if data_type == 'n':
+            value = float(value) if '.' in value or 'E' in value or 'e' in value else int(value)
+
+            style_id = cell_element.get('s')
+            if style_id and int(style_id) in self.date_formats:
+                try:
+                    return from_excel(value, self.epoch)
+                except ValueError:
+                    warn('Cell {} is marked as a date but the serial value {} is outside the limits for dates. The cell will be treated as an error.'.format(coordinate, value))
+                    return '#VALUE!'
+
+            return value
+        elif data_type == 's':
+            return self.shared_strings[int(value)]
+        elif data_type == 'b':
+            return bool(int(value))
+        elif data_type == 'd':
+            return from_ISO8601(value)
+
+        # 'str': 수식 결과 문자열, 'e': 오류 값
+        return value
+
+
+##################################################
+# 병렬 파싱 워커 프로세스
+##################################################
+
+# 워커 프로세스마다 공유 문자열을 한 번만 받아 두는 리더
+_worker_reader = None
+
+def _init_sheet_worker(shared_strings, date_formats, epoch):
+    global _worker_reader
+    _worker_reader = XlsxSheetReader(None, None, shared_strings, date_formats, epoch)
+
+def _read_row_chunk_in_worker(chunk):
+    return _worker_reader.read_row_chunk(chunk)
@@ -1,31 +1,102 @@
-import sys
+import argparse
 import json
-from exporter.data_exporter import DataExporter
+from exporter.data_exporter import DataExporter, DataExporterConfig
+from exporter.stage_profiler import StageProfiler
 from code.code_generator import CodeGenerator
+from watch.table_watcher import TableWatcher
 
-# argv[1]: 설정 파일 경로
-# argv[2]: 동작 모드
-def main():
-    config_file_path = sys.argv[1] if len(sys.argv) >= 2 else ''
-    if not config_file_path:
-        raise Exception('No config file path')
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('config_file_path', help='설정 파일 경로')
+    parser.add_argument('run_mode', choices=['export', 'code', 'watch', 'deps', 'cache'], help='동작 모드')
+    parser.add_argument('cache_action', nargs='?', choices=['clear'], help='cache 모드의 동작')
+    parser.add_argument('--jobs', type=int, help='export 시 동시에 내보낼 테이블 수')
+    parser.add_argument('--force', action='store_true', help='export 시 변경 여부와 무관하게 모든 테이블 내보내기')
+    parser.add_argument('--strict', action='store_true', help='export 시 jsonschema 로 테이블 데이터 전체 검사')
+    parser.add_argument('--profile', metavar='TRACE_FILE', help='단계별 실행 시간, 메모리를 Chrome trace event 형식으로 기록할 파일 경로')
+    parser.add_argument('--profile-memory', action='store_true', help='--profile 시 tracemalloc 으로 단계별 최대 메모리도 기록 (실행이 느려짐)')
+    parser.add_argument('--profile-table', action='append', metavar='TABLE_NAME', help='export 시 지정한 테이블만 함수 단위 측정. 여러 번 지정 가능')
+    parser.add_argument('--profile-dir', help='--profile-table 결과(.prof, .collapsed)를 쓸 디렉토리. 기본값 profile')
+    parser.add_argument('--profile-mode', choices=['cprofile', 'sample'], help='--profile-table 측정 방식. cprofile: 모든 호출 기록(.prof), sample: 호출 스택 샘플(.collapsed). 기본값 cprofile')
+    args = parser.parse_args()
+
+    # 동작은 cache 모드에만 있음
+    if args.run_mode == 'cache' and args.cache_action is None:
+        parser.error('cache mode requires an action: clear')
+    if args.run_mode != 'cache' and args.cache_action is not None:
+        parser.error('{} mode does not take an action: {}'.format(args.run_mode, args.cache_action))
+
+    return args
+
+# 스키마 파일별로 직접 참조하는 스키마와, 바뀌었을 때 다시 만들어야 하는 테이블/코드 파일
+def create_dependency_report(exporter, generator):
+    export_graph = exporter.build_schema_graph()
+    code_graph = generator.build_schema_graph()
 
-    run_mode = sys.argv[2] if len(sys.argv) >= 3 else ''
-    if not run_mode:
-        raise Exception('No run mode')
+    report = {}
+    for schema_file_name in sorted(generator.find_schema_file_names()):
+        references = export_graph.refs.get(schema_file_name, set()) | code_graph.refs.get(schema_file_name, set())
+        report[schema_file_name] = {
+            'references': sorted(references),
+            'tables': exporter.find_dependent_tables([schema_file_name]),
+            'code_files': [generator.get_code_file_name(file_name) for file_name in generator.find_dependent_schema_files([schema_file_name])]
+        }
 
-    with open(config_file_path) as config_file:
+    return report
+
+# @param profiler StageProfiler. --profile 지정 시에만 있음
+def run(args, profiler):
+    with open(args.config_file_path) as config_file:
         config_data = json.load(config_file)
         #print(config_data)
 
-        if run_mode == 'export':
-            exporter = DataExporter(config_data)
+        # 명령행 옵션은 설정 파일 값보다 우선
+        if args.jobs is not None:
+            config_data['jobs'] = args.jobs
+        if args.force:
+            config_data['force'] = True
+        if args.strict:
+            config_data['strict'] = True
+        if args.profile_table is not None:
+            config_data['profile_tables'] = args.profile_table
+        if args.profile_dir is not None:
+            config_data['profile_dir_path'] = args.profile_dir
+        if args.profile_mode is not None:
+            config_data['profile_mode'] = args.profile_mode
+
+        if args.run_mode == 'export':
+            exporter = DataExporter(config_data, profiler)
             exporter.run()
-        elif run_mode == 'code':
-            generator = CodeGenerator(config_data)
+        elif args.run_mode == 'code':
+            generator = CodeGenerator(config_data, profiler)
             generator.run()
+        elif args.run_mode == 'watch':
+            exporter = DataExporter(config_data, profiler)
+            generator = CodeGenerator(config_data, profiler)
+            watcher = TableWatcher(exporter, generator)
+            watcher.run()
+        elif args.run_mode == 'deps':
+            exporter = DataExporter(config_data)
+            generator = CodeGenerator(config_data)
+            report = create_dependency_report(exporter, generator)
+            print(json.dumps(report, indent=4, ensure_ascii=False))
+        elif args.run_mode == 'cache':
+            sheet_cache = DataExporter.create_sheet_cache(DataExporterConfig(config_data))
+            if sheet_cache is None:
+                raise Exception('sheet_cache_dir_path is not configured')
+            sheet_cache.clear()
         else:
-            raise Exception('Invalid run mode: ' + run_mode)
+            raise Exception('Invalid run mode: ' + args.run_mode)
+
+def main():
+    args = parse_args()
+    profiler = StageProfiler(args.profile_memory) if args.profile is not None else None
+
+    try:
+        run(args, profiler)
+    finally:
+        if profiler is not None:
+            profiler.save(args.profile)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,111 @@
+import contextlib
+import io
+import unittest
+from exporter.data_exporter import DataExporter
+from exporter.data_sheet import DataSheet
+
+# 평평한 테이블을 컬럼 단위로 읽는 iter_flat_node_array() 가 행 단위로 읽는 iter_node_array() 와
+# 같은 항목을 돌려주고, 오류가 있으면 같은 셀 위치로 같은 오류를 내는지 확인
+class FlatDecoderTest(unittest.TestCase):
+    SCHEMA = {
+        'type': 'array',
+        'items': {
+            'type': 'object',
+            'properties': {
+                'id': { 'type': 'integer' },
+                'intVal': { 'type': 'integer', 'minimum': 0 },
+                'floatVal': { 'type': 'number' },
+                'strVal': { 'type': 'string' },
+                'boolVal': { 'type': 'boolean' }
+            },
+            'required': [ 'id' ]
+        }
+    }
+    HEADER = ['id', 'intVal', 'floatVal', 'strVal', 'boolVal', 'comment']
+
+    def setUp(self):
+        exporter = DataExporter({ 'schema_dir_path': '.', 'table_dir_path': '.', 'asset_dir_path': '.' })
+        self.type_info_root = exporter.create_type_info(FlatDecoderTest.SCHEMA, 'Flat.table.json')
+
+    def test_rows(self):
+        self.assert_same_decoding([
+            [1, 10, 1.5, 'a', True, 'note'],
+            [None, None, None, None, None, 'comment only'],
+            [],
+            [2, '20', 2, 3, 'FALSE'],
+            [3, None, None, 'c']
+        ])
+
+    def test_parse_error(self):
+        self.assert_same_decoding([
+            [1, 10],
+            [2, 'abc'],
+            [3, 30]
+        ], 'coordinate:B3')
+
+    def test_constraint_error(self):
+        self.assert_same_decoding([
+            [1, 10],
+            [2, -1]
+        ], 'coordinate:B3')
+
+    def test_required_error(self):
+        self.assert_same_decoding([
+            [1, 10],
+            [None, 20]
+        ], 'coordinate:A3')
+
+    def test_duplicated_id(self):
+        self.assert_same_decoding([
+            [1, 10],
+            [1, 20]
+        ], 'coordinate:A3')
+
+    # 앞 컬럼은 뒤 행에서, 뒤 컬럼은 앞 행에서 실패하면 앞 행의 오류를 냄
+    def test_earlier_error_in_later_column(self):
+        self.assert_same_decoding([
+            [1, 10, 1.5],
+            [2, 20, 'x'],
+            [3, -1, 3.5]
+        ], 'coordinate:C3')
+
+    def assert_same_decoding(self, rows, expected_error=None):
+        sheet = DataSheet()
+        sheet.append_row(FlatDecoderTest.HEADER)
+        for row in rows:
+            sheet.append_row(row)
+        sheet.trim()
+
+        header_info_root = DataExporter.create_data_header_info(sheet, 1)
+        plan = DataExporter.compile_root_decode_plan(self.type_info_root, header_info_root)
+        self.assertTrue(DataExporter.is_flat_plan(plan))
+
+        row_max = max(sheet.max_row, 2)
+        flat_result = FlatDecoderTest.decode(DataExporter.iter_flat_node_array(sheet, plan, 2, row_max))
+        node_result = FlatDecoderTest.decode(DataExporter.iter_node_array(sheet, plan, 2, row_max))
+        self.assertEqual(flat_result, node_result)
+
+        datas, error, output = flat_result
+        if expected_error is None:
+            self.assertIsNone(error)
+        else:
+            self.assertIn(expected_error, error + output)
+
+    # @return 오류 전까지 읽은 항목, 오류 ('형식: 메시지'), 출력
+    @staticmethod
+    def decode(datas):
+        read_datas = []
+        error = None
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            try:
+                for data in datas:
+                    read_datas.append(data)
+            except Exception as e:
+                error = '{}: {}'.format(type(e).__name__, e)
+
+        return read_datas, error, output.getvalue()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from exporter.data_exporter import DataExporter
+from exporter.json_asset_writer import JsonAssetWriter
+
+# 레코드 단위로 쓴 JSON 어셋이 json.dumps(datas, indent=4, ensure_ascii=False) 를 한 번에 쓴 파일과 같은지 확인
+class JsonAssetWriterTest(unittest.TestCase):
+    SAMPLE_DIR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'docs', 'sample')
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test_sample_tables(self):
+        exporter = DataExporter({
+            'schema_dir_path': os.path.join(JsonAssetWriterTest.SAMPLE_DIR_PATH, 'schema'),
+            'table_dir_path': os.path.join(JsonAssetWriterTest.SAMPLE_DIR_PATH, 'tables'),
+            'asset_dir_path': self.dir_path
+        })
+
+        for table_name in exporter.find_table_names():
+            schema_file_name = table_name + '.table.json'
+            type_info_root = exporter.create_type_info(exporter.load_schema(schema_file_name, True), schema_file_name)
+            datas = list(exporter.read_table(type_info_root, table_name))
+
+            self.assert_same_as_json_dump(datas, table_name)
+
+    def test_escaped_and_nested_values(self):
+        datas = [
+            { 'id': 1, 'text': '줄\n바꿈 "따옴표" \\ \t', 'values': [1, 2.5, True, None], 'empty': {}, 'emptyList': [] },
+            { 'id': 2, 'nested': { 'list': [{ 'a': 1 }, { 'b': [1, [2, 3]] }] } }
+        ]
+        self.assert_same_as_json_dump(datas, 'Escaped')
+
+    # 항목이 없으면 null
+    def test_empty_table(self):
+        self.assert_same_as_json_dump(None, 'Empty')
+
+    def assert_same_as_json_dump(self, datas, table_name):
+        file_path = os.path.join(self.dir_path, table_name + '.json')
+        writer = JsonAssetWriter(file_path)
+
+        writer.open()
+        for data in datas or []:
+            writer.write_record(data)
+        writer.close()
+        writer.commit()
+
+        expected = json.dumps(datas, indent=4, ensure_ascii=False).replace('\n', os.linesep).encode('utf8')
+        with open(file_path, 'rb') as fp:
+            written = fp.read()
+
+        self.assertEqual(written, expected)
+        self.assertEqual(writer.digest, hashlib.sha256(expected).hexdigest())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from openpyxl import Workbook
+from exporter.data_exporter import DataExporter
+
+# 시트 크기(<dimension>)가 실제 셀 범위보다 작게 기록된 엑셀도 전체 모드처럼 모든 셀을 읽는지 확인
+class ReadDataSheetTest(unittest.TestCase):
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.dir_path, 'Stale.xlsx')
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = 'Data'
+        ws.append(['id', 'intVal', 'floatVal'])
+        ws.append([1, 10, 1.5])
+        ws.append([2, 20, 2.5])
+        ws.append([3, 30, 3.5])
+        wb.save(self.file_path)
+
+        DataExporterTestUtil.replace_dimension(self.file_path, 'A1:B2')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test_openpyxl_reader_ignores_stale_dimension(self):
+        self.assert_full_sheet(DataExporter.read_data_sheet(self.file_path, False))
+
+    def test_fast_reader_ignores_stale_dimension(self):
+        self.assert_full_sheet(DataExporter.read_data_sheet(self.file_path, True))
+
+    def assert_full_sheet(self, sheet):
+        self.assertEqual(sheet.max_row, 4)
+        self.assertEqual(sheet.max_column, 3)
+        self.assertEqual(sheet.value(1, 3), 'floatVal')
+        self.assertEqual(sheet.value(4, 3), 3.5)
+
+class DataExporterTestUtil:
+    # 워크시트 XML 의 시트 크기만 바꿔 다시 저장
+    @staticmethod
+    def replace_dimension(file_path, ref):
+        temp_file_path = file_path + '.tmp'
+
+        with zipfile.ZipFile(file_path) as src, zipfile.ZipFile(temp_file_path, 'w', zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                data = src.read(info.filename)
+                if info.filename == 'xl/worksheets/sheet1.xml':
+                    start = data.index(b'<dimension ref="') + len(b'<dimension ref="')
+                    data = data[:start] + ref.encode() + data[data.index(b'"', start):]
+                dst.writestr(info, data)
+
+        os.replace(temp_file_path, file_path)
+
+if __name__ == '__main__':
+    unittest.main()
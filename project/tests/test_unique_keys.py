@@ -0,0 +1,63 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from openpyxl import Workbook
+from exporter.data_exporter import DataExporter
+
+# 최상위 항목의 id 와 'x-index' 기본 키는 값이 겹치면 오류, 보조 키는 겹쳐도 됨
+class UniqueKeysTest(unittest.TestCase):
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+        self.config_json = {
+            'schema_dir_path': os.path.join(self.dir_path, 'schema'),
+            'table_dir_path': os.path.join(self.dir_path, 'tables'),
+            'asset_dir_path': os.path.join(self.dir_path, 'assets')
+        }
+        for dir_path in [self.config_json['schema_dir_path'], self.config_json['table_dir_path'], self.config_json['asset_dir_path']]:
+            os.makedirs(dir_path)
+
+        schema = {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'id': { 'type': 'integer' },
+                    'code': { 'type': 'string' },
+                    'groupId': { 'type': 'integer' }
+                },
+                'x-index': [ 'code', 'groupId' ]
+            }
+        }
+        with open(os.path.join(self.config_json['schema_dir_path'], 'Keyed.table.json'), 'w', encoding='utf8') as fp:
+            json.dump(schema, fp)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test_secondary_key_may_repeat(self):
+        self.write_table([[1, 'a', 10], [2, 'b', 10]])
+        DataExporter(self.config_json).export_table('Keyed')
+
+    def test_duplicated_id(self):
+        self.write_table([[1, 'a', 10], [1, 'b', 20]])
+        with self.assertRaisesRegex(Exception, r'Duplicated id: 1\. coordinate:A3'):
+            DataExporter(self.config_json).export_table('Keyed')
+
+    def test_duplicated_primary_index_key(self):
+        self.write_table([[1, 'a', 10], [2, 'a', 20]])
+        with self.assertRaisesRegex(Exception, r"Duplicated code: 'a'\. coordinate:B3"):
+            DataExporter(self.config_json).export_table('Keyed')
+
+    def write_table(self, rows):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = 'Data'
+        ws.append(['id', 'code', 'groupId'])
+        for row in rows:
+            ws.append(row)
+        wb.save(os.path.join(self.config_json['table_dir_path'], 'Keyed.xlsx'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import time
+from exporter.data_exporter import DataExporter
+
+# 테이블/스키마 디렉토리를 주기적으로 확인해 바뀐 파일에 해당하는 어셋과 코드만 다시 만든다.
+# DataExporter, CodeGenerator 를 계속 들고 있으므로 스키마 캐시와 검사기를 다시 만들지 않는다.
+class TableWatcher:
+    POLL_INTERVAL = 0.5     # 초. 파일 변경 확인 주기
+    DEBOUNCE = 1.0          # 초. 한 번 저장에 여러 번 쓰는 편집기를 위해 변경이 멈춘 뒤 이만큼 기다림
+
+    def __init__(self, exporter, generator):
+        self.exporter = exporter
+        self.generator = generator
+        self.table_dir_path = exporter.config.table_dir_path
+        self.schema_dir_path = exporter.config.schema_dir_path
+        self.snapshot = {}  # { 파일 경로 : (수정 시각, 크기) }
+
+    def run(self):
+        self.snapshot = self.take_snapshot()
+
+        # 공용 스키마가 바뀌었을 때 영향받는 테이블, 코드만 찾을 수 있도록 참조 관계를 미리 기록
+        self.run_reporting_failure(self.exporter.build_schema_graph)
+        self.run_reporting_failure(self.generator.build_schema_graph)
+        print('Watching {}, {}'.format(self.table_dir_path, self.schema_dir_path))
+
+        pending_paths = set()
+        last_change_time = 0
+
+        try:
+            while True:
+                time.sleep(TableWatcher.POLL_INTERVAL)
+
+                new_snapshot = self.take_snapshot()
+                changed_paths = TableWatcher.diff_snapshot(self.snapshot, new_snapshot)
+                self.snapshot = new_snapshot
+
+                if len(changed_paths) > 0:
+                    pending_paths.update(changed_paths)
+                    last_change_time = time.monotonic()
+                elif len(pending_paths) > 0 and time.monotonic() - last_change_time >= TableWatcher.DEBOUNCE:
+                    self.process_changes(pending_paths)
+                    pending_paths = set()
+        except KeyboardInterrupt:
+            pass
+
+    def take_snapshot(self):
+        snapshot = {}
+
+        for dir_path, extension in [(self.table_dir_path, '.xlsx'), (self.schema_dir_path, '.json')]:
+            for entry in os.scandir(dir_path):
+                # 엑셀이 편집 중에 만드는 잠금 파일 제외
+                if not entry.name.endswith(extension) or entry.name.startswith('~$'):
+                    continue
+
+                stat = entry.stat()
+                snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+    @staticmethod
+    def diff_snapshot(old_snapshot, new_snapshot):
+        changed_paths = set()
+
+        for path, file_stat in new_snapshot.items():
+            if old_snapshot.get(path) != file_stat:
+                changed_paths.add(path)
+
+        for path in old_snapshot:
+            if not path in new_snapshot:
+                changed_paths.add(path)
+
+        return changed_paths
+
+    def process_changes(self, changed_paths):
+        changed_schema_file_names = set()
+        table_names = set()
+
+        for path in changed_paths:
+            file_name = os.path.basename(path)
+
+            if file_name.endswith('.xlsx'):
+                table_names.add(file_name.split('.', 1)[0])
+            else:
+                changed_schema_file_names.add(file_name)
+
+        # 참조 관계는 바뀌기 전 스키마 기준으로 찾는다. 새로 생긴 참조는 다시 내보내면서 기록됨
+        table_names.update(self.exporter.find_dependent_tables(changed_schema_file_names))
+        code_schema_file_names = self.generator.find_dependent_schema_files(changed_schema_file_names)
+
+        for schema_file_name in sorted(changed_schema_file_names):
+            self.exporter.invalidate_schema(schema_file_name)
+            self.generator.invalidate_schema(schema_file_name)
+
+        # 삭제된 테이블, 스키마는 다시 만들지 않음
+        existing_table_names = set(self.exporter.find_table_names())
+        table_names = sorted(table_names & existing_table_names)
+
+        for schema_file_name in code_schema_file_names:
+            if os.path.exists(os.path.join(self.schema_dir_path, schema_file_name)):
+                self.run_reporting_failure(self.generator.generate_code_file, schema_file_name)
+
+        # 스키마, 검사기 캐시를 계속 쓰도록 jobs 설정과 관계없이 이 프로세스에서 내보낸다.
+        # 한 테이블이 실패해도 나머지 테이블은 내보낸다.
+        self.run_reporting_failure(self.export_tables, table_names)
+
+    def export_tables(self, table_names):
+        for result in self.exporter.iter_export_results(table_names):
+            if result.error is not None:
+                print('Exception on export_table(). table_name:{}'.format(result.table_name))
+                print('Exception on watch: {}: {}'.format(type(result.error).__name__, result.error))
+            else:
+                DataExporter.print_export_result(result)
+
+    # 감시 중에는 실패해도 멈추지 않고 다음 변경을 기다린다.
+    @staticmethod
+    def run_reporting_failure(func, *args):
+        try:
+            func(*args)
+        except Exception as e:
+            print('Exception on watch: {}: {}'.format(type(e).__name__, e))